@@ -17,7 +17,7 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from app.database import Base
-from app.models import User, InterviewSession, Question, Answer, Feedback
+from app.models import User, InterviewSession, Question, Answer, Feedback, LLMCacheEntry, UserStats, JobPosting, LLMJob
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,65 @@
+"""Indexes for per-user and per-session hot queries
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # interview_sessions: listings/history by user, newest first
+    op.create_index('ix_interview_sessions_user_id_created_at', 'interview_sessions', ['user_id', 'created_at'], unique=False)
+    
+    # interview_sessions: scored sessions for dashboard average and improvement rate
+    op.create_index(
+        'ix_interview_sessions_user_id_scored',
+        'interview_sessions',
+        ['user_id', 'created_at'],
+        unique=False,
+        postgresql_include=['overall_score'],
+        postgresql_where=sa.text('completed AND overall_score IS NOT NULL')
+    )
+    
+    # questions / answers / feedback: lookups by parent
+    op.create_index(op.f('ix_questions_session_id'), 'questions', ['session_id'], unique=False)
+    op.create_index(op.f('ix_answers_session_id'), 'answers', ['session_id'], unique=False)
+    op.create_index(op.f('ix_feedback_answer_id'), 'feedback', ['answer_id'], unique=False)
+    
+    # answers: keep only the latest answer per question before enforcing uniqueness
+    op.execute("""
+        DELETE FROM feedback
+        WHERE answer_id IN (
+            SELECT id FROM answers a
+            WHERE EXISTS (
+                SELECT 1 FROM answers newer
+                WHERE newer.question_id = a.question_id AND newer.id > a.id
+            )
+        )
+    """)
+    op.execute("""
+        DELETE FROM answers a
+        WHERE EXISTS (
+            SELECT 1 FROM answers newer
+            WHERE newer.question_id = a.question_id AND newer.id > a.id
+        )
+    """)
+    op.create_unique_constraint('uq_answers_question_id', 'answers', ['question_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_answers_question_id', 'answers', type_='unique')
+    op.drop_index(op.f('ix_feedback_answer_id'), table_name='feedback')
+    op.drop_index(op.f('ix_answers_session_id'), table_name='answers')
+    op.drop_index(op.f('ix_questions_session_id'), table_name='questions')
+    op.drop_index('ix_interview_sessions_user_id_scored', table_name='interview_sessions')
+    op.drop_index('ix_interview_sessions_user_id_created_at', table_name='interview_sessions')
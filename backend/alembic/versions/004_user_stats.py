@@ -0,0 +1,86 @@
+"""Per-user statistics summary table
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create user_stats table
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_sessions', sa.Integer(), nullable=False),
+    sa.Column('completed_sessions', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_count', sa.Integer(), nullable=False),
+    sa.Column('answers_count', sa.Integer(), nullable=False),
+    sa.Column('first_half_sum', sa.Float(), nullable=False),
+    sa.Column('first_half_count', sa.Integer(), nullable=False),
+    sa.Column('second_half_sum', sa.Float(), nullable=False),
+    sa.Column('second_half_count', sa.Integer(), nullable=False),
+    sa.Column('half_boundary_created_at', sa.DateTime(), nullable=True),
+    sa.Column('half_boundary_id', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    
+    # Backfill existing users (same result as scripts/user_stats.py backfill);
+    # the improvement rate halves split like crud.dashboard_stats_statement
+    op.execute("""
+        WITH ranked AS (
+            SELECT
+                user_id, created_at, id, overall_score,
+                row_number() OVER (PARTITION BY user_id ORDER BY created_at, id) AS position,
+                count(*) OVER (PARTITION BY user_id) AS scored
+            FROM interview_sessions
+            WHERE completed AND overall_score IS NOT NULL
+        ), halves AS (
+            SELECT
+                user_id,
+                coalesce(sum(overall_score) FILTER (WHERE position <= scored / 2), 0) AS first_half_sum,
+                count(*) FILTER (WHERE position <= scored / 2) AS first_half_count,
+                coalesce(sum(overall_score) FILTER (WHERE position > scored / 2), 0) AS second_half_sum,
+                count(*) FILTER (WHERE position > scored / 2) AS second_half_count,
+                max(created_at) FILTER (WHERE position = scored / 2 + 1) AS half_boundary_created_at,
+                max(id) FILTER (WHERE position = scored / 2 + 1) AS half_boundary_id
+            FROM ranked
+            GROUP BY user_id
+        )
+        INSERT INTO user_stats (
+            user_id, total_sessions, completed_sessions, score_sum, score_count, answers_count,
+            first_half_sum, first_half_count, second_half_sum, second_half_count,
+            half_boundary_created_at, half_boundary_id, updated_at
+        )
+        SELECT
+            u.id,
+            (SELECT count(*) FROM interview_sessions s WHERE s.user_id = u.id),
+            (SELECT count(*) FROM interview_sessions s WHERE s.user_id = u.id AND s.completed),
+            (SELECT coalesce(sum(s.overall_score), 0) FROM interview_sessions s WHERE s.user_id = u.id),
+            (SELECT count(s.overall_score) FROM interview_sessions s WHERE s.user_id = u.id),
+            (SELECT count(*) FROM answers a JOIN interview_sessions s ON s.id = a.session_id WHERE s.user_id = u.id),
+            coalesce(h.first_half_sum, 0),
+            coalesce(h.first_half_count, 0),
+            coalesce(h.second_half_sum, 0),
+            coalesce(h.second_half_count, 0),
+            h.half_boundary_created_at,
+            h.half_boundary_id,
+            now() AT TIME ZONE 'utc'
+        FROM users u
+        LEFT JOIN halves h ON h.user_id = u.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
@@ -0,0 +1,27 @@
+"""Extend the session listing index with id for keyset pagination
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # interview_sessions: listings/history by user, newest first, paged on (created_at, id)
+    op.create_index('ix_interview_sessions_user_id_created_at_id', 'interview_sessions', ['user_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_interview_sessions_user_id_created_at', table_name='interview_sessions')
+
+
+def downgrade() -> None:
+    op.create_index('ix_interview_sessions_user_id_created_at', 'interview_sessions', ['user_id', 'created_at'], unique=False)
+    op.drop_index('ix_interview_sessions_user_id_created_at_id', table_name='interview_sessions')
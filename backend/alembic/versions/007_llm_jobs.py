@@ -0,0 +1,54 @@
+"""LLM job queue
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create llm_jobs table
+    op.create_table('llm_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['interview_sessions.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_llm_jobs_id'), 'llm_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_llm_jobs_user_id'), 'llm_jobs', ['user_id'], unique=False)
+    op.create_index(
+        'ix_llm_jobs_pending',
+        'llm_jobs',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('queued', 'running')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_llm_jobs_pending', table_name='llm_jobs')
+    op.drop_index(op.f('ix_llm_jobs_user_id'), table_name='llm_jobs')
+    op.drop_index(op.f('ix_llm_jobs_id'), table_name='llm_jobs')
+    op.drop_table('llm_jobs')
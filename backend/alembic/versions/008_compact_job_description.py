@@ -0,0 +1,25 @@
+"""Compacted job description per session
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled in lazily when questions are first generated
+    op.add_column('interview_sessions', sa.Column('job_description_compact', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('interview_sessions', 'job_description_compact')
@@ -0,0 +1,25 @@
+"""Shared evaluation prompt context per session
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled in when questions are generated, or on the first evaluation for older sessions
+    op.add_column('interview_sessions', sa.Column('evaluation_context', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('interview_sessions', 'evaluation_context')
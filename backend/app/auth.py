@@ -1,15 +1,19 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
-from .database import get_db
+from .database import get_async_db, AnySession
 from . import models, schemas
+from .services.password_hasher import HashingOverloaded, get_password_hasher
+from .timing import span
 
 load_dotenv()
 
@@ -17,16 +21,28 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Principals resolved from the database are cached per (sub, exp) token.
+AUTH_PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+AUTH_PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+# Build the principal from the token's uid/username claims without any lookup.
+# Changes to a user then only take effect once their token expires.
+AUTH_TRUST_TOKEN_CLAIMS = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry",
+        headers={"Retry-After": "1"},
+    )
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    """Hash a password on the dedicated hashing pool"""
+    try:
+        return await get_password_hasher().hash(password)
+    except HashingOverloaded:
+        raise _hashing_busy()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
@@ -40,24 +56,120 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
+async def get_user_by_email(db: AnySession, email: str) -> Optional[models.User]:
     """Get user by email"""
-    return db.query(models.User).filter(models.User.email == email).first()
+    result = await db.execute(select(models.User).filter(models.User.email == email))
+    return result.scalars().first()
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[models.User]:
+async def authenticate_user(db: AnySession, email: str, password: str) -> Optional[models.User]:
     """Authenticate a user"""
-    user = get_user_by_email(db, email)
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    # bcrypt is CPU-bound; run it on the hashing pool, not the shared threadpool
+    try:
+        verified = await get_password_hasher().verify(password, user.hashed_password)
+    except HashingOverloaded:
+        raise _hashing_busy()
+    if not verified:
         return None
     return user
 
+def token_claims(user: models.User) -> Dict[str, Any]:
+    """Claims identifying a user in an access token"""
+    return {"sub": user.email, "uid": user.id, "username": user.username}
+
+class PrincipalCache:
+    """
+    TTL- and size-bounded LRU cache of principals, keyed by (sub, exp)
+
+    Entries never outlive the token they were resolved for. The cache is
+    per process, so after a user changes, other workers may serve the old
+    principal for up to the TTL.
+    """
+
+    def __init__(self, max_entries: int = AUTH_PRINCIPAL_CACHE_MAX_ENTRIES, ttl_seconds: int = AUTH_PRINCIPAL_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # Mapper events may fire from threadpool threads
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Optional[int]], tuple]" = OrderedDict()
+
+    def get(self, sub: str, exp: Optional[int]) -> Optional[schemas.Principal]:
+        """Return the cached principal for a token, or None on a miss"""
+        key = (sub, exp)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, sub: str, exp: Optional[int], principal: schemas.Principal) -> None:
+        """Cache a principal until the TTL passes or the token expires"""
+        expires_at = time.monotonic() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, time.monotonic() + (exp - time.time()))
+        with self._lock:
+            self._entries[(sub, exp)] = (expires_at, principal)
+            self._entries.move_to_end((sub, exp))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, sub: str) -> None:
+        """Drop every cached principal for a subject"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == sub]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for this cache"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None,
+            "size": len(self._entries),
+            "trust_token_claims": AUTH_TRUST_TOKEN_CLAIMS
+        }
+
+principal_cache = PrincipalCache()
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_cached_principal(mapper, connection, target: models.User) -> None:
+    """Forget cached principals of a changed user, under old and new email"""
+    history = inspect(target).attrs.email.history
+    for email in [target.email, *(history.deleted or ())]:
+        if email:
+            principal_cache.invalidate(email)
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> models.User:
-    """Get current authenticated user from JWT token"""
+    db: AnySession = Depends(get_async_db)
+) -> schemas.Principal:
+    """
+    Get the current principal from the JWT token
+
+    Resolved from the token claims when AUTH_TRUST_TOKEN_CLAIMS is set,
+    otherwise from the principal cache, and only then from the database.
+    Handlers that need the full user row load it themselves.
+    """
+    with span("auth"):
+        return await _resolve_principal(token, db)
+
+async def _resolve_principal(token: str, db: AnySession) -> schemas.Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -73,8 +185,18 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = get_user_by_email(db, email=token_data.email)
+    if AUTH_TRUST_TOKEN_CLAIMS and "uid" in payload and "username" in payload:
+        return schemas.Principal(id=payload["uid"], email=email, username=payload["username"])
+    
+    exp = payload.get("exp")
+    principal = principal_cache.get(email, exp)
+    if principal is not None:
+        return principal
+    
+    user = await get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
     
-    return user
+    principal = schemas.Principal(id=user.id, email=user.email, username=user.username)
+    principal_cache.set(email, exp, principal)
+    return principal
@@ -0,0 +1,643 @@
+from sqlalchemy import Select, and_, func, insert, select, true, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
+
+from . import models
+from .database import AnySession
+from .services.answer_evaluator import AnswerEvaluator
+from .services.prompt_compactor import get_prompt_compactor
+from .timing import span
+
+# Loader options for InterviewSessionDetail: one SELECT for the session and
+# one for its questions, with each question's answer and feedback joined in.
+# Anything else the serializer touches raises instead of lazy loading.
+SESSION_DETAIL_LOADERS = (
+    selectinload(models.InterviewSession.questions)
+    .joinedload(models.Question.answer)
+    .joinedload(models.Answer.feedback),
+    raiseload("*"),
+)
+
+async def get_session_detail(db: AnySession, session_id: int, user_id: int) -> Optional[models.InterviewSession]:
+    """
+    Load a session with its questions, answers and feedback in two queries
+
+    Args:
+        db: Database session
+        session_id: Interview session to load
+        user_id: Owner of the session
+
+    Returns:
+        The session, or None if it does not exist or belongs to someone else
+    """
+    result = await db.execute(
+        select(models.InterviewSession).options(*SESSION_DETAIL_LOADERS).filter(
+            models.InterviewSession.id == session_id,
+            models.InterviewSession.user_id == user_id
+        )
+    )
+    return result.unique().scalars().first()
+
+# Columns returned by session listings; job_description is opt-in since it
+# is by far the largest column.
+SESSION_LIST_COLUMNS = (
+    models.InterviewSession.id,
+    models.InterviewSession.job_title,
+    models.InterviewSession.company_name,
+    models.InterviewSession.job_url,
+    models.InterviewSession.created_at,
+    models.InterviewSession.completed,
+    models.InterviewSession.overall_score,
+)
+
+def encode_session_cursor(created_at: datetime, session_id: int) -> str:
+    """Build the opaque cursor pointing just past a listed session"""
+    payload = json.dumps([created_at.isoformat(), session_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_session_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Parse a cursor produced by encode_session_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, session_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(session_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def session_list_statement(
+    user_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    include_description: bool = False
+) -> Select:
+    """
+    Build one page of a user's sessions, newest first
+
+    Pages are keyed on (created_at, id) rather than an offset, so every page
+    is a bounded range scan of ix_interview_sessions_user_id_created_at_id
+    no matter how deep into the history it is.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    sessions = models.InterviewSession
+    columns = SESSION_LIST_COLUMNS + ((sessions.job_description,) if include_description else ())
+
+    statement = select(*columns).filter(sessions.user_id == user_id)
+    if cursor:
+        statement = statement.filter(
+            tuple_(sessions.created_at, sessions.id) < tuple_(*decode_session_cursor(cursor))
+        )
+    return statement.order_by(sessions.created_at.desc(), sessions.id.desc()).limit(limit)
+
+async def list_sessions(
+    db: AnySession,
+    user_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    include_description: bool = False
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Get one page of a user's sessions, newest first
+
+    Args:
+        db: Database session
+        user_id: Owner of the sessions
+        limit: Maximum number of sessions to return
+        cursor: next_cursor from the previous page, or None for the first page
+        include_description: Whether to load job_description
+
+    Returns:
+        Tuple of (sessions as dictionaries, cursor for the next page or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    # Fetch one extra row to learn whether another page exists
+    result = await db.execute(session_list_statement(user_id, limit + 1, cursor, include_description))
+    rows = [dict(row) for row in result.mappings().all()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_session_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return rows, next_cursor
+
+async def create_interview_session(
+    db: AnySession,
+    user_id: int,
+    job_title: str,
+    company_name: Optional[str],
+    job_description: str,
+    job_url: Optional[str] = None
+) -> models.InterviewSession:
+    """
+    Add a new interview session and count it in the user's statistics
+
+    The session is flushed but not committed.
+
+    Returns:
+        The new session
+    """
+    db_session = models.InterviewSession(
+        user_id=user_id,
+        job_title=job_title,
+        company_name=company_name,
+        job_description=job_description,
+        job_url=job_url
+    )
+    db.add(db_session)
+    await record_session_created(db, user_id)
+    await db.flush()
+    return db_session
+
+def compact_job_description(session: models.InterviewSession) -> str:
+    """
+    Get the session's job description as it goes into prompts
+
+    Compacted on first use and kept on the session; the caller's commit
+    persists it.
+    """
+    if session.job_description_compact is None:
+        with span("compact"):
+            session.job_description_compact = get_prompt_compactor().compact(session.job_description)
+    return session.job_description_compact
+
+def evaluation_context(session: models.InterviewSession) -> str:
+    """
+    Get the job summary, skills and rubric shared by the session's evaluation prompts
+
+    Built when questions are generated, or on first use for older sessions,
+    and kept on the session; the caller's commit persists it.
+    """
+    if session.evaluation_context is None:
+        session.evaluation_context = AnswerEvaluator.build_session_context(
+            session.job_title,
+            session.company_name,
+            compact_job_description(session)
+        )
+    return session.evaluation_context
+
+async def count_questions(db: AnySession, session_id: int) -> int:
+    """Count the questions generated for a session"""
+    return await db.scalar(select(func.count(models.Question.id)).filter(
+        models.Question.session_id == session_id
+    ))
+
+async def save_questions(db: AnySession, session_id: int, questions_data: List[Dict]) -> List[models.Question]:
+    """
+    Add generated questions to a session
+
+    The questions are flushed but not committed.
+
+    Args:
+        db: Database session
+        session_id: Interview session the questions belong to
+        questions_data: Questions from QuestionGenerator
+
+    Returns:
+        The new questions, in order
+    """
+    db_questions = []
+    for q_data in questions_data:
+        db_question = models.Question(
+            session_id=session_id,
+            question_text=q_data["question_text"],
+            question_type=q_data.get("question_type", "behavioral"),
+            difficulty=q_data.get("difficulty", "medium"),
+            order=q_data.get("order", 1)
+        )
+        db.add(db_question)
+        db_questions.append(db_question)
+    await db.flush()
+    return db_questions
+
+async def save_answer_evaluation(
+    db: AnySession,
+    session: models.InterviewSession,
+    question_id: int,
+    answer_text: str,
+    evaluation: Dict
+) -> models.Answer:
+    """
+    Create or update the answer and feedback for a question
+
+    The changes are flushed but not committed, so callers can group
+    several answers into one transaction.
+
+    Args:
+        db: Database session
+        session: Interview session the question belongs to
+        question_id: Question being answered
+        answer_text: The candidate's answer
+        evaluation: Scores and feedback from AnswerEvaluator
+
+    Returns:
+        The saved answer with its feedback attached
+    """
+    result = await db.execute(
+        select(models.Answer).options(
+            selectinload(models.Answer.feedback)
+        ).filter(models.Answer.question_id == question_id)
+    )
+    db_answer = result.scalars().first()
+
+    if db_answer:
+        # Update existing answer
+        db_answer.answer_text = answer_text
+        db_answer.created_at = datetime.utcnow() # Update timestamp
+        db_feedback = db_answer.feedback
+    else:
+        # Create new answer
+        db_answer = models.Answer(
+            session_id=session.id,
+            question_id=question_id,
+            answer_text=answer_text
+        )
+        db.add(db_answer)
+        db_feedback = None
+        await _increment_user_stats(db, session.user_id, answers_count=1)
+
+    db_answer.relevance_score = evaluation["relevance_score"]
+    db_answer.structure_score = evaluation["structure_score"]
+    db_answer.professionalism_score = evaluation["professionalism_score"]
+    db_answer.overall_score = evaluation["overall_score"]
+
+    if db_feedback:
+        # Update existing feedback
+        db_feedback.created_at = datetime.utcnow()
+    else:
+        db_feedback = models.Feedback()
+        db_answer.feedback = db_feedback
+
+    db_feedback.strengths = evaluation["strengths"]
+    db_feedback.weaknesses = evaluation["weaknesses"]
+    db_feedback.suggestions = evaluation["suggestions"]
+    db_feedback.star_analysis = evaluation["star_analysis"]
+    db_feedback.example_answer = evaluation["example_answer"]
+    await db.flush()
+
+    return db_answer
+
+async def update_session_score(db: AnySession, session: models.InterviewSession) -> None:
+    """
+    Mark the session completed and set its overall score once every question is answered
+
+    The session row is locked and re-read first, so concurrent final answers
+    for one session (a batch and a single submit) count its completion once.
+    Like every writer of user statistics, the user's UserStats row is locked
+    before it.
+
+    Args:
+        db: Database session with all answers flushed
+        session: Interview session to update
+    """
+    stats, _ = await _lock_user_stats(db, session.user_id)
+    await db.flush()  # Keep pending changes to the session through the re-read
+    await db.execute(
+        select(models.InterviewSession).filter(
+            models.InterviewSession.id == session.id
+        ).with_for_update().execution_options(populate_existing=True)
+    )
+
+    total_questions = await db.scalar(
+        select(func.count(models.Question.id)).filter(
+            models.Question.session_id == session.id
+        )
+    )
+
+    result = await db.execute(
+        select(
+            func.count(models.Answer.id),
+            func.avg(models.Answer.overall_score)
+        ).filter(
+            models.Answer.session_id == session.id
+        )
+    )
+    answered_questions, avg_score = result.one()
+
+    if total_questions and total_questions == answered_questions:
+        was_completed = session.completed
+        previous_score = session.overall_score
+        session.overall_score = avg_score
+        session.completed = True
+        await _record_session_score(db, stats, session, was_completed, previous_score)
+
+def dashboard_stats_statement(user_id: int) -> Select:
+    """
+    Build the single statement behind /dashboard/stats
+
+    Session counts and the average come from one aggregate over the user's
+    sessions. The improvement rate splits completed, scored sessions into
+    halves by created_at with row_number(); like the original Python
+    version, an odd count puts the extra session in the second half.
+    """
+    sessions = models.InterviewSession
+    is_scored = and_(sessions.completed == true(), sessions.overall_score.isnot(None))
+
+    totals = select(
+        func.count(sessions.id).label("total_sessions"),
+        func.count(sessions.id).filter(sessions.completed == true()).label("completed_sessions"),
+        func.avg(sessions.overall_score).label("average_score")
+    ).filter(
+        sessions.user_id == user_id
+    ).subquery()
+
+    answered = select(func.count(models.Answer.id)).join(
+        sessions
+    ).filter(
+        sessions.user_id == user_id
+    ).scalar_subquery()
+
+    ranked = select(
+        sessions.overall_score,
+        func.row_number().over(order_by=(sessions.created_at, sessions.id)).label("position"),
+        func.count().over().label("scored_sessions")
+    ).filter(
+        sessions.user_id == user_id,
+        is_scored
+    ).subquery()
+
+    first_half = ranked.c.position <= ranked.c.scored_sessions // 2
+    halves = select(
+        func.avg(ranked.c.overall_score).filter(first_half).label("first_half_avg"),
+        func.avg(ranked.c.overall_score).filter(~first_half).label("second_half_avg")
+    ).subquery()
+
+    return select(
+        totals.c.total_sessions,
+        totals.c.completed_sessions,
+        totals.c.average_score,
+        answered.label("total_questions_answered"),
+        halves.c.first_half_avg,
+        halves.c.second_half_avg
+    ).select_from(totals).join(halves, true())
+
+async def get_dashboard_stats(db: AnySession, user_id: int) -> Dict[str, Any]:
+    """
+    Compute the dashboard statistics for a user in one round trip
+
+    Args:
+        db: Database session
+        user_id: User to compute statistics for
+
+    Returns:
+        Dictionary matching schemas.DashboardStats
+    """
+    result = await db.execute(dashboard_stats_statement(user_id))
+    row = result.one()
+
+    # Calculate improvement rate (compare first half vs second half of sessions)
+    if row.completed_sessions >= 4 and row.first_half_avg is not None and row.second_half_avg is not None:
+        first_half_avg = float(row.first_half_avg)
+        second_half_avg = float(row.second_half_avg)
+        improvement_rate = ((second_half_avg - first_half_avg) / first_half_avg) * 100 if first_half_avg > 0 else 0
+    else:
+        improvement_rate = None
+
+    return {
+        "total_sessions": row.total_sessions,
+        "completed_sessions": row.completed_sessions,
+        "average_score": float(row.average_score) if row.average_score else None,
+        "total_questions_answered": row.total_questions_answered,
+        "improvement_rate": improvement_rate
+    }
+
+async def record_session_created(db: AnySession, user_id: int) -> None:
+    """Count a new interview session in the user's statistics"""
+    await _increment_user_stats(db, user_id, total_sessions=1)
+
+async def _increment_user_stats(db: AnySession, user_id: int, **deltas: int) -> None:
+    """Atomically add deltas to UserStats counters"""
+    result = await db.execute(
+        update(models.UserStats).where(
+            models.UserStats.user_id == user_id
+        ).values(
+            updated_at=datetime.utcnow(),
+            **{name: getattr(models.UserStats, name) + delta for name, delta in deltas.items()}
+        )
+    )
+    if result.rowcount == 0:
+        # Rebuilt from the tables, which already include the change
+        await _lock_user_stats(db, user_id)
+
+# Dialects whose INSERT can skip a row that already exists
+_INSERT_IGNORING_CONFLICTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+async def _lock_user_stats(db: AnySession, user_id: int) -> Tuple[models.UserStats, bool]:
+    """
+    Lock the user's UserStats row, creating it if it is missing
+
+    The row is created at registration. If it has gone missing it is upserted
+    and rebuilt from the tables, pending changes included, so the counters
+    cannot silently stop being maintained.
+
+    Returns:
+        The locked row, and whether it was rebuilt
+    """
+    result = await db.execute(
+        select(models.UserStats).filter(
+            models.UserStats.user_id == user_id
+        ).with_for_update()
+    )
+    stats = result.scalars().first()
+    if stats is not None:
+        return stats, False
+
+    print(f"user_stats row missing for user {user_id}; rebuilding it")
+    dialect_insert = _INSERT_IGNORING_CONFLICTS.get(db.bind.dialect.name)
+    if dialect_insert is not None:
+        await db.execute(
+            dialect_insert(models.UserStats).values(
+                user_id=user_id
+            ).on_conflict_do_nothing(index_elements=[models.UserStats.user_id])
+        )
+    else:
+        # No ON CONFLICT here; a concurrent rebuild of the same row fails the transaction
+        await db.execute(insert(models.UserStats).values(user_id=user_id))
+    await db.flush()
+    return await recompute_user_stats(db, user_id), True
+
+async def _record_session_score(
+    db: AnySession,
+    stats: models.UserStats,
+    session: models.InterviewSession,
+    was_completed: bool,
+    previous_score: Optional[float]
+) -> None:
+    """Apply a session's completion or score change to the user's locked statistics row"""
+    if not was_completed:
+        stats.completed_sessions += 1
+    if previous_score is not None:
+        stats.score_sum -= previous_score
+        stats.score_count -= 1
+    if session.overall_score is not None:
+        stats.score_sum += session.overall_score
+        stats.score_count += 1
+
+    # The session's half; it keeps its place in time, so it stays in the same one
+    in_first_half = stats.half_boundary_id is None or (
+        (session.created_at, session.id) < (stats.half_boundary_created_at, stats.half_boundary_id)
+    )
+    if previous_score is not None:
+        _add_to_half(stats, in_first_half, -previous_score, -1)
+    if session.overall_score is not None:
+        _add_to_half(stats, in_first_half, session.overall_score, 1)
+    if previous_score is None or session.overall_score is None:
+        await _rebalance_halves(db, stats)
+    stats.updated_at = datetime.utcnow()
+
+def _add_to_half(stats: models.UserStats, first_half: bool, score: float, count: int) -> None:
+    if first_half:
+        stats.first_half_sum += score
+        stats.first_half_count += count
+    else:
+        stats.second_half_sum += score
+        stats.second_half_count += count
+
+async def _rebalance_halves(db: AnySession, stats: models.UserStats) -> None:
+    """
+    Move sessions across the half boundary until the first half holds floor(n / 2)
+
+    A session joining or leaving changes n by one, so at most one session
+    moves, found with one indexed lookup on (user_id, created_at, id).
+    """
+    await db.flush()  # The lookups must see the session's new score
+    sessions = models.InterviewSession
+    scored = select(sessions.created_at, sessions.id, sessions.overall_score).filter(
+        sessions.user_id == stats.user_id,
+        sessions.completed == true(),
+        sessions.overall_score.isnot(None)
+    )
+    session_key = tuple_(sessions.created_at, sessions.id)
+
+    target = (stats.first_half_count + stats.second_half_count) // 2
+    while stats.first_half_count != target:
+        boundary = tuple_(stats.half_boundary_created_at, stats.half_boundary_id)
+        if stats.first_half_count > target:
+            # The newest session of the first half moves to the second
+            statement = scored.order_by(sessions.created_at.desc(), sessions.id.desc()).limit(1)
+            if stats.half_boundary_id is not None:
+                statement = statement.filter(session_key < boundary)
+            rows = (await db.execute(statement)).all()
+        else:
+            # The oldest session of the second half moves to the first
+            rows = (await db.execute(
+                scored.filter(session_key >= boundary).order_by(sessions.created_at, sessions.id).limit(2)
+            )).all()
+
+        if not rows:
+            # The counters disagree with the sessions table
+            await recompute_user_stats(db, stats.user_id)
+            return
+
+        created_at, session_id, score = rows[0]
+        if stats.first_half_count > target:
+            _add_to_half(stats, True, -score, -1)
+            _add_to_half(stats, False, score, 1)
+            stats.half_boundary_created_at, stats.half_boundary_id = created_at, session_id
+        else:
+            _add_to_half(stats, False, -score, -1)
+            _add_to_half(stats, True, score, 1)
+            following = rows[1] if len(rows) > 1 else (None, None, None)
+            stats.half_boundary_created_at, stats.half_boundary_id = following[0], following[1]
+
+def user_stats_payload(stats: models.UserStats) -> Dict[str, Any]:
+    """
+    Build the /dashboard/stats response from a UserStats row
+
+    Args:
+        stats: The user's maintained statistics
+
+    Returns:
+        Dictionary matching schemas.DashboardStats
+    """
+    # Calculate improvement rate (compare first half vs second half of sessions)
+    if stats.completed_sessions >= 4 and stats.first_half_count > 0:
+        first_half_avg = stats.first_half_sum / stats.first_half_count
+        second_half_avg = stats.second_half_sum / stats.second_half_count
+        improvement_rate = ((second_half_avg - first_half_avg) / first_half_avg) * 100 if first_half_avg > 0 else 0
+    else:
+        improvement_rate = None
+
+    average_score = stats.score_sum / stats.score_count if stats.score_count else None
+
+    return {
+        "total_sessions": stats.total_sessions,
+        "completed_sessions": stats.completed_sessions,
+        "average_score": average_score if average_score else None,
+        "total_questions_answered": stats.answers_count,
+        "improvement_rate": improvement_rate
+    }
+
+async def recompute_user_stats(db: AnySession, user_id: int) -> models.UserStats:
+    """
+    Rebuild a user's UserStats row from the sessions and answers tables
+
+    The row is added to the session but not committed.
+
+    Args:
+        db: Database session
+        user_id: User to recompute
+
+    Returns:
+        The refreshed UserStats row
+    """
+    sessions = models.InterviewSession
+
+    result = await db.execute(
+        select(
+            func.count(sessions.id),
+            func.count(sessions.id).filter(sessions.completed == true()),
+            func.coalesce(func.sum(sessions.overall_score), 0.0),
+            func.count(sessions.overall_score)
+        ).filter(sessions.user_id == user_id)
+    )
+    total_sessions, completed_sessions, score_sum, score_count = result.one()
+
+    answers_count = await db.scalar(
+        select(func.count(models.Answer.id)).join(sessions).filter(sessions.user_id == user_id)
+    )
+
+    result = await db.execute(
+        select(sessions.created_at, sessions.id, sessions.overall_score).filter(
+            sessions.user_id == user_id,
+            sessions.completed == true(),
+            sessions.overall_score.isnot(None)
+        ).order_by(sessions.created_at, sessions.id)
+    )
+    scored = result.all()
+    mid_point = len(scored) // 2
+
+    result = await db.execute(
+        select(models.UserStats).filter(models.UserStats.user_id == user_id).with_for_update()
+    )
+    stats = result.scalars().first()
+    if stats is None:
+        stats = models.UserStats(user_id=user_id)
+        db.add(stats)
+
+    stats.total_sessions = total_sessions
+    stats.completed_sessions = completed_sessions
+    stats.score_sum = float(score_sum)
+    stats.score_count = score_count
+    stats.answers_count = answers_count
+    stats.first_half_sum = float(sum(score for _, _, score in scored[:mid_point]))
+    stats.first_half_count = mid_point
+    stats.second_half_sum = float(sum(score for _, _, score in scored[mid_point:]))
+    stats.second_half_count = len(scored) - mid_point
+    if scored:
+        stats.half_boundary_created_at, stats.half_boundary_id = scored[mid_point][0], scored[mid_point][1]
+    else:
+        stats.half_boundary_created_at = stats.half_boundary_id = None
+    stats.updated_at = datetime.utcnow()
+    return stats
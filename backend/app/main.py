@@ -1,7 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .routes import auth_routes, interview_routes, dashboard_routes
+from fastapi.responses import PlainTextResponse
+from .database import engine, async_engine, Base, get_pool_stats
+from .routes import auth_routes, interview_routes, dashboard_routes, job_routes
+from .services.http_client import close_http_clients
+from .services.llm_client import close_async_client
+from .services.password_hasher import close_password_hasher, get_password_hasher
+from .services.pdf_extractor import close_pdf_pool
+from .services.skill_matcher import get_skill_matcher
+from .auth import principal_cache
+from .services.job_posting_cache import get_job_posting_cache
+from .services.llm_cache import get_llm_cache
+from .services.prompt_compactor import get_prompt_compactor
+from .services.structured_output import get_output_parser
+from .timing import TimingMiddleware, registry, render_gauges
 
 # # Create database tables
 # Base.metadata.create_all(bind=engine)
@@ -19,12 +31,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Location", "Server-Timing"],  # Session list pagination, queued jobs, timing
 )
 
+# Outermost, so its timings include the other middleware
+app.add_middleware(TimingMiddleware)
+
+@app.on_event("startup")
+async def startup():
+    """Build the skill matcher before the first request needs it"""
+    get_skill_matcher()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release shared client and database connections"""
+    await close_async_client()
+    await close_http_clients()
+    close_password_hasher()
+    close_pdf_pool()
+    if async_engine is not None:
+        await async_engine.dispose()
+
 # Include routers
 app.include_router(auth_routes.router)
 app.include_router(interview_routes.router)
 app.include_router(dashboard_routes.router)
+app.include_router(job_routes.router)
 
 @app.get("/")
 def root():
@@ -39,3 +71,30 @@ def root():
 def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+@app.get("/health/db")
+def database_pool_health():
+    """Connection pool gauges"""
+    return get_pool_stats()
+
+@app.get("/health/auth")
+def auth_health():
+    """Password hashing pool gauges and principal cache counters"""
+    return {
+        "hashing": get_password_hasher().stats(),
+        "principal_cache": principal_cache.stats()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus metrics: request and stage histograms, pool, cache and LLM output gauges"""
+    lines = registry.render()
+    for engine_name, stats in get_pool_stats().items():
+        lines.extend(render_gauges(f"db_pool_{engine_name}", stats))
+    lines.extend(render_gauges("password_hashing", get_password_hasher().stats()))
+    lines.extend(render_gauges("principal_cache", principal_cache.stats()))
+    lines.extend(render_gauges("llm_cache", get_llm_cache().stats()))
+    lines.extend(render_gauges("job_posting_cache", get_job_posting_cache().stats()))
+    lines.extend(render_gauges("prompt_compaction", get_prompt_compactor().stats()))
+    lines.extend(render_gauges("structured_output", get_output_parser().stats()))
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean, Index, JSON, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -26,6 +26,10 @@ class InterviewSession(Base):
     company_name = Column(String)
     job_description = Column(Text, nullable=False)
     job_url = Column(String)
+    # job_description compacted to the prompt token budget, computed once per session
+    job_description_compact = Column(Text)
+    # Job summary, skills and rubric shared by every answer evaluation prompt of the session
+    evaluation_context = Column(Text)
     
     # Session metadata
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -36,12 +40,24 @@ class InterviewSession(Base):
     user = relationship("User", back_populates="interview_sessions")
     questions = relationship("Question", back_populates="session", cascade="all, delete-orphan")
     answers = relationship("Answer", back_populates="session", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Per-user listings and history, newest first; id breaks ties for keyset pagination
+        Index("ix_interview_sessions_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Scored sessions for dashboard averages and improvement rate
+        Index(
+            "ix_interview_sessions_user_id_scored",
+            "user_id", "created_at",
+            postgresql_include=["overall_score"],
+            postgresql_where=text("completed AND overall_score IS NOT NULL")
+        ),
+    )
 
 class Question(Base):
     __tablename__ = "questions"
     
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False, index=True)
     
     question_text = Column(Text, nullable=False)
     question_type = Column(String)  # behavioral, technical, situational
@@ -57,7 +73,7 @@ class Answer(Base):
     __tablename__ = "answers"
     
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
     
     answer_text = Column(Text, nullable=False)
@@ -74,12 +90,17 @@ class Answer(Base):
     session = relationship("InterviewSession", back_populates="answers")
     question = relationship("Question", back_populates="answer")
     feedback = relationship("Feedback", back_populates="answer", uselist=False)
+    
+    __table_args__ = (
+        # One answer per question; also serves lookups by question
+        UniqueConstraint("question_id", name="uq_answers_question_id"),
+    )
 
 class Feedback(Base):
     __tablename__ = "feedback"
     
     id = Column(Integer, primary_key=True, index=True)
-    answer_id = Column(Integer, ForeignKey("answers.id"), nullable=False)
+    answer_id = Column(Integer, ForeignKey("answers.id"), nullable=False, index=True)
     
     # Detailed feedback
     strengths = Column(Text)
@@ -92,3 +113,85 @@ class Feedback(Base):
     
     # Relationships
     answer = relationship("Answer", back_populates="feedback")
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+    
+    key = Column(String(64), primary_key=True)  # SHA-256 of the normalized request
+    value = Column(Text, nullable=False)  # JSON-encoded response
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    
+    # Counters maintained alongside sessions and answers
+    total_sessions = Column(Integer, nullable=False, default=0)
+    completed_sessions = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)  # Sum of session overall scores
+    score_count = Column(Integer, nullable=False, default=0)  # Sessions with an overall score
+    answers_count = Column(Integer, nullable=False, default=0)
+    
+    # Completed, scored sessions split into chronological halves for the
+    # improvement rate; an odd count puts the extra session in the second half
+    first_half_sum = Column(Float, nullable=False, default=0.0)
+    first_half_count = Column(Integer, nullable=False, default=0)
+    second_half_sum = Column(Float, nullable=False, default=0.0)
+    second_half_count = Column(Integer, nullable=False, default=0)
+    # (created_at, id) of the oldest session in the second half; None while it is empty
+    half_boundary_created_at = Column(DateTime)
+    half_boundary_id = Column(Integer)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class JobPosting(Base):
+    __tablename__ = "job_postings"
+    
+    url = Column(String, primary_key=True)  # Normalized job posting URL
+    
+    # Parsed posting
+    job_title = Column(String)
+    company_name = Column(String)
+    job_description = Column(Text, nullable=False)
+    
+    # Revalidation
+    etag = Column(String)
+    last_modified = Column(String)
+    content_hash = Column(String(64), nullable=False)  # SHA-256 of the fetched page
+    
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+class LLMJob(Base):
+    __tablename__ = "llm_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+    
+    kind = Column(String, nullable=False)  # generate_questions, evaluate_answer, evaluate_answers
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    payload = Column(JSON, nullable=False)  # Request body
+    result = Column(JSON)  # Response body, same shape as the inline endpoint's
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    
+    # Not claimable before this time: retry backoff while queued, lease expiry while running
+    locked_until = Column(DateTime)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    __table_args__ = (
+        # Queue scan for workers; finished jobs are left out
+        Index(
+            "ix_llm_jobs_pending",
+            "id",
+            postgresql_where=text("status IN ('queued', 'running')")
+        ),
+    )
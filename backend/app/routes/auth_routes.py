@@ -1,18 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from datetime import timedelta
 
 from .. import models, schemas, auth
-from ..database import get_db
+from ..database import get_async_db, AnySession
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 @router.post("/register", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate, db: AnySession = Depends(get_async_db)):
     """Register a new user"""
     
     # Check if user already exists
-    db_user = auth.get_user_by_email(db, email=user.email)
+    db_user = await auth.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -20,9 +20,10 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if username is taken
-    existing_username = db.query(models.User).filter(
+    result = await db.execute(select(models.User).filter(
         models.User.username == user.username
-    ).first()
+    ))
+    existing_username = result.scalars().first()
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -30,7 +31,7 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = auth.get_password_hash(user.password)
+    hashed_password = await auth.hash_password(user.password)
     db_user = models.User(
         email=user.email,
         username=user.username,
@@ -38,16 +39,17 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.flush()
+    db.add(models.UserStats(user_id=db_user.id))
+    await db.commit()
     
     return db_user
 
 @router.post("/login", response_model=schemas.Token)
-def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: schemas.UserLogin, db: AnySession = Depends(get_async_db)):
     """Login and get access token"""
     
-    user = auth.authenticate_user(db, user_credentials.email, user_credentials.password)
+    user = await auth.authenticate_user(db, user_credentials.email, user_credentials.password)
     
     if not user:
         raise HTTPException(
@@ -59,13 +61,25 @@ def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
     # Create access token
     access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = auth.create_access_token(
-        data={"sub": user.email},
+        data=auth.token_claims(user),
         expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=schemas.User)
-async def get_current_user_info(current_user: models.User = Depends(auth.get_current_user)):
+async def get_current_user_info(
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
+):
     """Get current user information"""
-    return current_user
+    
+    user = await db.get(models.User, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return user
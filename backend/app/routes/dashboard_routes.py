@@ -1,81 +1,41 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
 
-from .. import models, schemas, auth
-from ..database import get_db
+from .. import models, schemas, auth, crud
+from ..database import get_async_db, AnySession
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/stats", response_model=schemas.DashboardStats)
-def get_dashboard_stats(
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+async def get_dashboard_stats(
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
 ):
     """Get dashboard statistics for current user"""
     
-    # Total sessions
-    total_sessions = db.query(models.InterviewSession).filter(
-        models.InterviewSession.user_id == current_user.id
-    ).count()
+    # Maintained incrementally by the interview routes
+    stats = await db.get(models.UserStats, current_user.id)
+    if stats is not None:
+        return crud.user_stats_payload(stats)
     
-    # Completed sessions
-    completed_sessions = db.query(models.InterviewSession).filter(
-        models.InterviewSession.user_id == current_user.id,
-        models.InterviewSession.completed == True
-    ).count()
-    
-    # Average score
-    avg_score_result = db.query(func.avg(models.InterviewSession.overall_score)).filter(
-        models.InterviewSession.user_id == current_user.id,
-        models.InterviewSession.overall_score.isnot(None)
-    ).scalar()
-    
-    average_score = float(avg_score_result) if avg_score_result else None
-    
-    # Total questions answered
-    total_questions_answered = db.query(models.Answer).join(
-        models.InterviewSession
-    ).filter(
-        models.InterviewSession.user_id == current_user.id
-    ).count()
-    
-    # Calculate improvement rate (compare first half vs second half of sessions)
-    if completed_sessions >= 4:
-        sessions_ordered = db.query(models.InterviewSession).filter(
-            models.InterviewSession.user_id == current_user.id,
-            models.InterviewSession.completed == True,
-            models.InterviewSession.overall_score.isnot(None)
-        ).order_by(models.InterviewSession.created_at).all()
-        
-        mid_point = len(sessions_ordered) // 2
-        first_half_avg = sum(s.overall_score for s in sessions_ordered[:mid_point]) / mid_point
-        second_half_avg = sum(s.overall_score for s in sessions_ordered[mid_point:]) / (len(sessions_ordered) - mid_point)
-        
-        improvement_rate = ((second_half_avg - first_half_avg) / first_half_avg) * 100 if first_half_avg > 0 else 0
-    else:
-        improvement_rate = None
-    
-    return {
-        "total_sessions": total_sessions,
-        "completed_sessions": completed_sessions,
-        "average_score": average_score,
-        "total_questions_answered": total_questions_answered,
-        "improvement_rate": improvement_rate
-    }
+    # Not backfilled yet: compute from the sessions table
+    return await crud.get_dashboard_stats(db, current_user.id)
 
-@router.get("/history", response_model=schemas.SessionHistory)
-def get_session_history(
-    limit: int = 10,
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+@router.get("/history", response_model=schemas.SessionHistory, response_model_exclude_unset=True)
+async def get_session_history(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_description: bool = False,
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
 ):
-    """Get recent session history"""
+    """Get recent session history, one page at a time"""
     
-    sessions = db.query(models.InterviewSession).filter(
-        models.InterviewSession.user_id == current_user.id
-    ).order_by(
-        models.InterviewSession.created_at.desc()
-    ).limit(limit).all()
+    try:
+        sessions, next_cursor = await crud.list_sessions(
+            db, current_user.id, limit, cursor, include_description
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    return {"sessions": sessions}
+    return {"sessions": sessions, "next_cursor": next_cursor}
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from typing import List, Optional
+import os
 
-from .. import models, schemas, auth
-from ..database import get_db
+from .. import models, schemas, auth, crud
+from ..database import get_async_db, new_async_session, release_connection, AnySession
 from ..services.job_parser import JobParser
+from ..services.job_posting_cache import get_job_posting_cache
+from ..services.llm_jobs import LLM_JOB_QUEUE, enqueue_job
+from ..services.pdf_extractor import PDFTooLarge, spool_upload
 from ..services.question_generator import QuestionGenerator
-from ..services.answer_evaluator import AnswerEvaluator
+from ..services.answer_evaluator import AnswerEvaluator, SCORE_FIELDS, FEEDBACK_FIELDS
+from ..services.sse import sse_event
 
 router = APIRouter(prefix="/interviews", tags=["Interviews"])
 
@@ -17,10 +22,10 @@ question_generator = QuestionGenerator()
 answer_evaluator = AnswerEvaluator()
 
 @router.post("/", response_model=schemas.InterviewSessionBase, status_code=status.HTTP_201_CREATED)
-def create_interview_session(
+async def create_interview_session(
     session_data: schemas.InterviewSessionCreate,
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
 ):
     """Create a new interview session"""
     
@@ -29,10 +34,10 @@ def create_interview_session(
     company_name = session_data.company_name
     job_url = session_data.job_url
     
-    # If URL is provided, parse it
+    # If URL is provided, parse it (or reuse an earlier parse of the same posting)
     if job_url and not job_description:
         try:
-            parsed_data = job_parser.parse_from_url(job_url)
+            parsed_data = await get_job_posting_cache().get_or_parse(job_url)
             job_description = parsed_data.get("job_description", "")
             if not job_title or job_title == "Unknown":
                 job_title = parsed_data.get("job_title", job_title)
@@ -51,45 +56,89 @@ def create_interview_session(
         )
     
     # Create interview session
-    db_session = models.InterviewSession(
-        user_id=current_user.id,
-        job_title=job_title,
-        company_name=company_name,
-        job_description=job_description,
-        job_url=job_url
+    db_session = await crud.create_interview_session(
+        db, current_user.id, job_title, company_name, job_description, job_url
     )
+    await db.commit()
     
-    db.add(db_session)
-    db.commit()
-    db.refresh(db_session)
+    return db_session
+
+@router.post("/pdf", response_model=schemas.InterviewSessionBase, status_code=status.HTTP_201_CREATED)
+async def create_interview_session_from_pdf(
+    file: UploadFile = File(...),
+    job_title: str = Form(...),
+    company_name: Optional[str] = Form(None),
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
+):
+    """Create a new interview session from an uploaded PDF job description"""
+    
+    try:
+        path = await spool_upload(file)
+        try:
+            job_description = await job_parser.parse_from_pdf_file(path)
+        finally:
+            os.unlink(path)
+    except PDFTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if not job_description:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No text could be extracted from the PDF"
+        )
+    
+    db_session = await crud.create_interview_session(
+        db, current_user.id, job_title, company_name, job_description
+    )
+    await db.commit()
     
     return db_session
 
-@router.get("/", response_model=List[schemas.InterviewSessionBase])
-def get_user_sessions(
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+@router.get("/", response_model=List[schemas.InterviewSessionSummary], response_model_exclude_unset=True)
+async def get_user_sessions(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_description: bool = False,
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
 ):
-    """Get all interview sessions for current user"""
+    """
+    Get interview sessions for current user, newest first
     
-    sessions = db.query(models.InterviewSession).filter(
-        models.InterviewSession.user_id == current_user.id
-    ).order_by(models.InterviewSession.created_at.desc()).all()
+    The cursor for the next page, if any, is returned in the X-Next-Cursor header.
+    """
+    
+    try:
+        sessions, next_cursor = await crud.list_sessions(
+            db, current_user.id, limit, cursor, include_description
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return sessions
 
 @router.get("/{session_id}", response_model=schemas.InterviewSessionDetail)
-def get_session_detail(
+async def get_session_detail(
     session_id: int,
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
 ):
     """Get detailed information about a specific session"""
     
-    session = db.query(models.InterviewSession).filter(
-        models.InterviewSession.id == session_id,
-        models.InterviewSession.user_id == current_user.id
-    ).first()
+    session = await crud.get_session_detail(db, session_id, current_user.id)
     
     if not session:
         raise HTTPException(
@@ -100,18 +149,23 @@ def get_session_detail(
     return session
 
 @router.post("/{session_id}/questions", response_model=List[schemas.QuestionBase])
-def generate_questions(
+async def generate_questions(
     session_id: int,
     question_params: schemas.QuestionGenerate,
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
 ):
-    """Generate interview questions for a session"""
+    """
+    Generate interview questions for a session
     
-    session = db.query(models.InterviewSession).filter(
+    In queue mode (LLM_JOB_QUEUE=true) answers 202 with the job; see /jobs.
+    """
+    
+    result = await db.execute(select(models.InterviewSession).filter(
         models.InterviewSession.id == session_id,
         models.InterviewSession.user_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -120,9 +174,7 @@ def generate_questions(
         )
     
     # Check if questions already exist
-    existing_questions = db.query(models.Question).filter(
-        models.Question.session_id == session_id
-    ).count()
+    existing_questions = await crud.count_questions(db, session_id)
     
     if existing_questions > 0:
         raise HTTPException(
@@ -130,11 +182,17 @@ def generate_questions(
             detail="Questions already generated for this session"
         )
     
-    # Generate questions using AI
+    if LLM_JOB_QUEUE:
+        return await _enqueue(db, current_user.id, session_id, "generate_questions", question_params.model_dump())
+    
+    # Generate questions using AI; the evaluation context is saved with them
+    job_description = crud.compact_job_description(session)
+    crud.evaluation_context(session)
+    await release_connection(db)
     try:
-        questions_data = question_generator.generate_questions(
+        questions_data = await question_generator.generate_questions(
             job_title=session.job_title,
-            job_description=session.job_description,
+            job_description=job_description,
             company_name=session.company_name,
             num_questions=question_params.num_questions,
             difficulty=question_params.difficulty or "medium"
@@ -146,40 +204,30 @@ def generate_questions(
         )
     
     # Save questions to database
-    db_questions = []
-    for q_data in questions_data:
-        db_question = models.Question(
-            session_id=session_id,
-            question_text=q_data["question_text"],
-            question_type=q_data.get("question_type", "behavioral"),
-            difficulty=q_data.get("difficulty", "medium"),
-            order=q_data.get("order", 1)
-        )
-        db.add(db_question)
-        db_questions.append(db_question)
-    
-    db.commit()
-    
-    # Refresh all questions
-    for q in db_questions:
-        db.refresh(q)
+    db_questions = await crud.save_questions(db, session_id, questions_data)
+    await db.commit()
     
     return db_questions
 
 @router.post("/{session_id}/answer", response_model=schemas.AnswerWithFeedback)
-def submit_answer(
+async def submit_answer(
     session_id: int,
     answer_data: schemas.AnswerCreate,
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
 ):
-    """Submit an answer and get AI feedback"""
+    """
+    Submit an answer and get AI feedback
+    
+    In queue mode (LLM_JOB_QUEUE=true) answers 202 with the job; see /jobs.
+    """
     
     # Verify session belongs to user
-    session = db.query(models.InterviewSession).filter(
+    result = await db.execute(select(models.InterviewSession).filter(
         models.InterviewSession.id == session_id,
         models.InterviewSession.user_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -188,10 +236,11 @@ def submit_answer(
         )
     
     # Get the question
-    question = db.query(models.Question).filter(
+    result = await db.execute(select(models.Question).filter(
         models.Question.id == answer_data.question_id,
         models.Question.session_id == session_id
-    ).first()
+    ))
+    question = result.scalars().first()
     
     if not question:
         raise HTTPException(
@@ -199,18 +248,20 @@ def submit_answer(
             detail="Question not found"
         )
     
-    # Check if answer already exists
-    existing_answer = db.query(models.Answer).filter(
-        models.Answer.question_id == answer_data.question_id
-    ).first()
+    if LLM_JOB_QUEUE:
+        return await _enqueue(db, current_user.id, session_id, "evaluate_answer", answer_data.model_dump())
     
     # Evaluate the answer using AI
+    session_context = crud.evaluation_context(session)
+    question_text = question.question_text
+    question_type = question.question_type
+    await release_connection(db)
     try:
-        evaluation = answer_evaluator.evaluate_answer(
-            question=question.question_text,
+        evaluation = await answer_evaluator.evaluate_answer(
+            question=question_text,
             answer=answer_data.answer_text,
-            question_type=question.question_type,
-            job_context=f"{session.job_title} at {session.company_name or 'the company'}"
+            question_type=question_type,
+            session_context=session_context
         )
     except Exception as e:
         raise HTTPException(
@@ -218,94 +269,217 @@ def submit_answer(
             detail=f"Failed to evaluate answer: {str(e)}"
         )
     
-    if existing_answer:
-        # Update existing answer
-        existing_answer.answer_text = answer_data.answer_text
-        existing_answer.relevance_score = evaluation["relevance_score"]
-        existing_answer.structure_score = evaluation["structure_score"]
-        existing_answer.professionalism_score = evaluation["professionalism_score"]
-        existing_answer.overall_score = evaluation["overall_score"]
-        existing_answer.created_at = datetime.utcnow() # Update timestamp
-        
-        db_answer = existing_answer
-        
-        # Update existing feedback
-        if existing_answer.feedback:
-            existing_answer.feedback.strengths = evaluation["strengths"]
-            existing_answer.feedback.weaknesses = evaluation["weaknesses"]
-            existing_answer.feedback.suggestions = evaluation["suggestions"]
-            existing_answer.feedback.star_analysis = evaluation["star_analysis"]
-            existing_answer.feedback.example_answer = evaluation["example_answer"]
-            existing_answer.feedback.created_at = datetime.utcnow()
-            db_feedback = existing_answer.feedback
-        else:
-            # Create feedback if it somehow didn't exist
-            db_feedback = models.Feedback(
-                answer_id=db_answer.id,
-                strengths=evaluation["strengths"],
-                weaknesses=evaluation["weaknesses"],
-                suggestions=evaluation["suggestions"],
-                star_analysis=evaluation["star_analysis"],
-                example_answer=evaluation["example_answer"]
-            )
-            db.add(db_feedback)
-            
-    else:
-        # Create new answer
-        db_answer = models.Answer(
-            session_id=session_id,
-            question_id=answer_data.question_id,
-            answer_text=answer_data.answer_text,
-            relevance_score=evaluation["relevance_score"],
-            structure_score=evaluation["structure_score"],
-            professionalism_score=evaluation["professionalism_score"],
-            overall_score=evaluation["overall_score"]
+    db_answer = await crud.save_answer_evaluation(
+        db,
+        session=session,
+        question_id=answer_data.question_id,
+        answer_text=answer_data.answer_text,
+        evaluation=evaluation
+    )
+    
+    # Update session score if all questions answered
+    await crud.update_session_score(db, session)
+    await db.commit()
+    
+    return db_answer
+
+@router.post("/{session_id}/answers:batch", response_model=List[schemas.AnswerWithFeedback])
+async def submit_answers_batch(
+    session_id: int,
+    batch: schemas.AnswerBatchCreate,
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
+):
+    """
+    Submit several answers at once and get AI feedback for each
+    
+    In queue mode (LLM_JOB_QUEUE=true) answers 202 with the job; see /jobs.
+    """
+    
+    # Verify session belongs to user
+    result = await db.execute(select(models.InterviewSession).filter(
+        models.InterviewSession.id == session_id,
+        models.InterviewSession.user_id == current_user.id
+    ))
+    session = result.scalars().first()
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
         )
-        
-        db.add(db_answer)
-        db.commit()
-        db.refresh(db_answer)
-        
-        # Create new feedback
-        db_feedback = models.Feedback(
-            answer_id=db_answer.id,
-            strengths=evaluation["strengths"],
-            weaknesses=evaluation["weaknesses"],
-            suggestions=evaluation["suggestions"],
-            star_analysis=evaluation["star_analysis"],
-            example_answer=evaluation["example_answer"]
+    
+    if not batch.answers:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one answer is required"
         )
-        
-        db.add(db_feedback)
+    
+    question_ids = [a.question_id for a in batch.answers]
+    if len(set(question_ids)) != len(question_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each question may only be answered once per batch"
+        )
+    
+    # Get all questions in one query
+    result = await db.execute(select(models.Question).filter(
+        models.Question.id.in_(question_ids),
+        models.Question.session_id == session_id
+    ))
+    questions = {q.id: q for q in result.scalars().all()}
+    
+    if len(questions) != len(question_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    if LLM_JOB_QUEUE:
+        return await _enqueue(db, current_user.id, session_id, "evaluate_answers", batch.model_dump())
+    
+    session_context = crud.evaluation_context(session)
+    
+    evaluation_items = [
+        {
+            "question": questions[a.question_id].question_text,
+            "answer": a.answer_text,
+            "question_type": questions[a.question_id].question_type,
+            "session_context": session_context
+        }
+        for a in batch.answers
+    ]
+    
+    # Evaluate all answers concurrently
+    await release_connection(db)
+    try:
+        evaluations = await answer_evaluator.evaluate_answers(evaluation_items)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to evaluate answers: {str(e)}"
+        )
+    
+    # Persist everything in a single transaction
+    db_answers = []
+    for a, evaluation in zip(batch.answers, evaluations):
+        db_answers.append(await crud.save_answer_evaluation(
+            db,
+            session=session,
+            question_id=a.question_id,
+            answer_text=a.answer_text,
+            evaluation=evaluation
+        ))
+    
+    await crud.update_session_score(db, session)
+    await db.commit()
+    
+    return db_answers
 
-    db.commit()
-    db.refresh(db_answer)
-    if db_answer.feedback:
-        db.refresh(db_answer.feedback)
+@router.post("/{session_id}/answer/stream")
+async def submit_answer_stream(
+    session_id: int,
+    answer_data: schemas.AnswerCreate,
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
+):
+    """
+    Submit an answer and stream AI feedback as Server-Sent Events
     
-    # Update session score if all questions answered
-    total_questions = db.query(models.Question).filter(
+    Events:
+        scores: all four scores, as soon as they are generated
+        feedback: {"field": ..., "value": ...} for each feedback field
+        answer: the saved answer with feedback (same shape as POST /answer)
+    """
+    
+    # Verify session belongs to user
+    result = await db.execute(select(models.InterviewSession).filter(
+        models.InterviewSession.id == session_id,
+        models.InterviewSession.user_id == current_user.id
+    ))
+    session = result.scalars().first()
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    # Get the question
+    result = await db.execute(select(models.Question).filter(
+        models.Question.id == answer_data.question_id,
         models.Question.session_id == session_id
-    ).count()
+    ))
+    question = result.scalars().first()
     
-    answered_questions = db.query(models.Answer).filter(
-        models.Answer.session_id == session_id
-    ).count()
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    question_text = question.question_text
+    question_type = question.question_type
+    session_context = crud.evaluation_context(session)
     
-    if total_questions == answered_questions:
-        # Calculate overall session score
-        all_scores = db.query(models.Answer.overall_score).filter(
-            models.Answer.session_id == session_id
-        ).all()
+    async def event_stream():
+        evaluation = {}
+        scores_sent = False
         
-        avg_score = sum(score[0] for score in all_scores) / len(all_scores)
-        session.overall_score = avg_score
-        session.completed = True
-        db.commit()
-    
-    # Return answer with feedback
-    # Ensure feedback is loaded
-    if not db_answer.feedback:
-        db_answer.feedback = db_feedback
+        async for field, value in answer_evaluator.evaluate_answer_stream(
+            question=question_text,
+            answer=answer_data.answer_text,
+            question_type=question_type,
+            session_context=session_context
+        ):
+            evaluation[field] = value
+            if field in FEEDBACK_FIELDS:
+                yield sse_event("feedback", {"field": field, "value": value})
+            elif not scores_sent and all(f in evaluation for f in SCORE_FIELDS):
+                scores_sent = True
+                yield sse_event("scores", {f: evaluation[f] for f in SCORE_FIELDS})
         
-    return db_answer
+        evaluation = answer_evaluator.complete_evaluation(evaluation, answer_data.answer_text)
+        if not scores_sent:
+            yield sse_event("scores", {f: evaluation[f] for f in SCORE_FIELDS})
+        
+        # The request-scoped session is released once the response starts,
+        # so persist with a session owned by the stream.
+        stream_db = new_async_session()
+        try:
+            stream_session = await stream_db.get(models.InterviewSession, session_id)
+            db_answer = await crud.save_answer_evaluation(
+                stream_db,
+                session=stream_session,
+                question_id=answer_data.question_id,
+                answer_text=answer_data.answer_text,
+                evaluation=evaluation
+            )
+            await crud.update_session_score(stream_db, stream_session)
+            await stream_db.commit()
+            
+            answer_out = schemas.AnswerWithFeedback.model_validate(db_answer)
+            yield sse_event("answer", answer_out.model_dump(mode="json"))
+        except Exception as e:
+            await stream_db.rollback()
+            yield sse_event("error", {"detail": f"Failed to save answer: {str(e)}"})
+        finally:
+            await stream_db.close()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _enqueue(db: AnySession, user_id: int, session_id: int, kind: str, payload: dict) -> JSONResponse:
+    """Queue an LLM job and answer 202 with where to poll for it"""
+    job = await enqueue_job(db, user_id, session_id, kind, payload)
+    await db.commit()
+    
+    job_out = schemas.LLMJob.model_validate(job)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=job_out.model_dump(mode="json"),
+        headers={"Location": f"/jobs/{job.id}"}
+    )
@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from dotenv import load_dotenv
+import asyncio
+import os
+
+from .. import schemas, auth
+from ..database import get_async_db, new_async_session, AnySession
+from ..services.llm_jobs import FINISHED_STATUSES, get_job
+from ..services.sse import sse_event
+
+load_dotenv()
+
+# How often the event stream re-reads a job, and for how long at most
+JOB_EVENTS_POLL_SECONDS = float(os.getenv("JOB_EVENTS_POLL_SECONDS", "0.5"))
+JOB_EVENTS_TIMEOUT_SECONDS = float(os.getenv("JOB_EVENTS_TIMEOUT_SECONDS", "300"))
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+@router.get("/{job_id}", response_model=schemas.LLMJob)
+async def get_job_status(
+    job_id: int,
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
+):
+    """Get the status of a queued LLM job, with its result once it succeeded"""
+    
+    job = await get_job(db, job_id, current_user.id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return job
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    current_user: schemas.Principal = Depends(auth.get_current_user),
+    db: AnySession = Depends(get_async_db)
+):
+    """
+    Follow a queued LLM job as Server-Sent Events
+    
+    Events:
+        status: the job, whenever its status or attempt count changes
+        result: the finished job (succeeded or failed); the stream then ends
+        timeout: sent if the job is still unfinished after JOB_EVENTS_TIMEOUT_SECONDS
+    """
+    
+    job = await get_job(db, job_id, current_user.id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    user_id = current_user.id
+    
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + JOB_EVENTS_TIMEOUT_SECONDS
+        current = job
+        last_seen = None
+        
+        while True:
+            job_out = schemas.LLMJob.model_validate(current).model_dump(mode="json")
+            if current.status in FINISHED_STATUSES:
+                yield sse_event("result", job_out)
+                return
+            if (current.status, current.attempts) != last_seen:
+                last_seen = (current.status, current.attempts)
+                yield sse_event("status", job_out)
+            if loop.time() >= deadline:
+                yield sse_event("timeout", job_out)
+                return
+            
+            # A short-lived session per poll, so waiting holds no connection
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+            poll_db = new_async_session()
+            try:
+                current = await get_job(poll_db, job_id, user_id)
+            finally:
+                await poll_db.close()
+            if current is None:
+                return
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Any, Optional, List
 from datetime import datetime
 
 # User Schemas
@@ -28,6 +28,12 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     email: Optional[str] = None
 
+class Principal(BaseModel):
+    """The authenticated user as resolved from an access token"""
+    id: int
+    email: str
+    username: str
+
 # Interview Session Schemas
 class InterviewSessionCreate(BaseModel):
     job_title: str
@@ -48,6 +54,19 @@ class InterviewSessionBase(BaseModel):
     class Config:
         from_attributes = True
 
+class InterviewSessionSummary(BaseModel):
+    id: int
+    job_title: str
+    company_name: Optional[str]
+    job_description: Optional[str] = None  # Only included when requested
+    job_url: Optional[str]
+    created_at: datetime
+    completed: bool
+    overall_score: Optional[float]
+    
+    class Config:
+        from_attributes = True
+
 # Question Schemas
 class QuestionBase(BaseModel):
     id: int
@@ -68,6 +87,9 @@ class AnswerCreate(BaseModel):
     question_id: int
     answer_text: str
 
+class AnswerBatchCreate(BaseModel):
+    answers: List[AnswerCreate]
+
 class AnswerBase(BaseModel):
     id: int
     question_id: int
@@ -111,4 +133,20 @@ class DashboardStats(BaseModel):
     improvement_rate: Optional[float]
 
 class SessionHistory(BaseModel):
-    sessions: List[InterviewSessionBase]
+    sessions: List[InterviewSessionSummary]
+    next_cursor: Optional[str] = None
+
+# Job Schemas
+class LLMJob(BaseModel):
+    id: int
+    session_id: int
+    kind: str
+    status: str
+    attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
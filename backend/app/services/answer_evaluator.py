@@ -1,52 +1,43 @@
-from openai import OpenAI
-import os
-from typing import Dict, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-import json
+import asyncio
+import os
+
+from .llm_client import get_async_client, OPENAI_MODEL
+from .json_stream import JSONObjectStreamParser
+from .skill_matcher import get_skill_matcher
+from .structured_output import (
+    AnswerEvaluation, EvaluationFields, StructuredOutputError, get_output_parser, response_format
+)
+from ..timing import span
 
 load_dotenv()
 
-class AnswerEvaluator:
-    """Service for evaluating interview answers using AI"""
-    
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        self.client = OpenAI(api_key=api_key)
-    
-    def evaluate_answer(
-        self,
-        question: str,
-        answer: str,
-        question_type: str = "behavioral",
-        job_context: str = None
-    ) -> Dict:
-        """
-        Evaluate an interview answer and provide detailed feedback
-        
-        Args:
-            question: The interview question
-            answer: The candidate's answer
-            question_type: Type of question (behavioral, technical, situational)
-            job_context: Additional context about the job (optional)
-            
-        Returns:
-            Dictionary with scores and detailed feedback
-        """
-        
-        context_text = f"\n\nJob Context: {job_context}" if job_context else ""
-        
-        prompt = f"""You are an expert interview coach evaluating a candidate's answer.
+BATCH_EVALUATION_CONCURRENCY = int(os.getenv("BATCH_EVALUATION_CONCURRENCY", "5"))
 
-Question Type: {question_type}
-Question: {question}
+SCORE_FIELDS = [
+    'relevance_score', 'structure_score', 'professionalism_score', 'overall_score'
+]
+SUB_SCORE_FIELDS = SCORE_FIELDS[:3]
+# Used for every score when a response has none
+DEFAULT_SCORE = 70.0
 
-Candidate's Answer:
-{answer}
-{context_text}
+FEEDBACK_FIELDS = [
+    'strengths', 'weaknesses', 'suggestions', 'star_analysis', 'example_answer'
+]
+
+EVALUATION_FIELDS = SCORE_FIELDS + FEEDBACK_FIELDS
+
+# Skills listed in a session's evaluation context
+EVALUATION_CONTEXT_SKILLS = int(os.getenv("EVALUATION_CONTEXT_SKILLS", "15"))
+
+# Identical for every evaluation, so it leads the prompt; the session context
+# follows and only the question and answer change from one call to the next.
+# Keeping the start of the prompt stable lets the provider's prompt cache
+# reuse it across a session's answers.
+EVALUATION_INSTRUCTIONS = """You are an expert interview coach providing constructive, detailed feedback on a candidate's answers.
 
-Evaluate this answer on the following criteria (score 0-100 for each):
+Evaluate each answer on the following criteria (score 0-100 for each):
 1. Relevance: How well does the answer address the question?
 2. Structure: Is the answer well-organized? (For behavioral questions, check STAR method: Situation, Task, Action, Result)
 3. Professionalism: Is the language professional and clear?
@@ -59,7 +50,7 @@ Also provide:
 - Example Answer: A brief example of a stronger answer
 
 Return your evaluation as a JSON object with this structure:
-{{
+{
   "relevance_score": 85,
   "structure_score": 75,
   "professionalism_score": 90,
@@ -69,56 +60,282 @@ Return your evaluation as a JSON object with this structure:
   "suggestions": "Try to quantify your impact...",
   "star_analysis": "Situation and Task were clear, but Action and Result need more detail...",
   "example_answer": "A stronger answer would be..."
-}}
+}
 
-Return ONLY valid JSON, no additional text.
-"""
+Always respond with valid JSON only, no additional text."""
+
+class AnswerEvaluator:
+    """Service for evaluating interview answers using AI"""
+    
+    def __init__(self):
+        self.client = get_async_client()
+        self.model = OPENAI_MODEL
+        self.output_parser = get_output_parser()
+    
+    async def evaluate_answer(
+        self,
+        question: str,
+        answer: str,
+        question_type: str = "behavioral",
+        job_context: str = None,
+        session_context: str = None
+    ) -> Dict:
+        """
+        Evaluate an interview answer and provide detailed feedback
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert interview coach providing constructive, detailed feedback. Always respond with valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=1500
-            )
-            
-            content = response.choices[0].message.content.strip()
+        Args:
+            question: The interview question
+            answer: The candidate's answer
+            question_type: Type of question (behavioral, technical, situational)
+            job_context: Additional context about the job (optional)
+            session_context: The session's context from build_session_context(); takes
+                the place of job_context (optional)
             
-            # Parse JSON response
-            evaluation = json.loads(content)
+        Returns:
+            Dictionary with scores and detailed feedback
+        """
+        
+        try:
+            with span("llm"):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(question, answer, question_type, job_context, session_context),
+                    temperature=0.7,
+                    max_tokens=1500,
+                    **response_format(self.model)
+                )
             
-            # Ensure all required fields exist
-            required_fields = [
-                'relevance_score', 'structure_score', 'professionalism_score',
-                'overall_score', 'strengths', 'weaknesses', 'suggestions',
-                'star_analysis', 'example_answer'
-            ]
+            content = response.choices[0].message.content or ""
             
-            for field in required_fields:
-                if field not in evaluation:
-                    if 'score' in field:
-                        evaluation[field] = 70.0
-                    else:
-                        evaluation[field] = "Not available"
+            # Parse and validate; malformed output gets a repair call, not a regeneration
+            evaluation = await self.output_parser.parse("evaluation", content, AnswerEvaluation)
             
-            return evaluation
+            return self._fill_missing_fields(evaluation.model_dump(exclude_none=True))
             
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
+        except StructuredOutputError as e:
+            print(f"Unparseable evaluation: {e}")
             return self._generate_fallback_evaluation(answer)
         except Exception as e:
             print(f"Error evaluating answer: {e}")
             return self._generate_fallback_evaluation(answer)
     
+    async def evaluate_answers(
+        self,
+        items: List[Dict],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Evaluate several answers concurrently
+        
+        Args:
+            items: Keyword arguments for evaluate_answer, one dict per answer
+            max_concurrency: Maximum evaluations in flight (defaults to BATCH_EVALUATION_CONCURRENCY)
+            
+        Returns:
+            Evaluations in the same order as items
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or BATCH_EVALUATION_CONCURRENCY)
+        
+        async def evaluate(item: Dict) -> Dict:
+            async with semaphore:
+                return await self.evaluate_answer(**item)
+        
+        return await asyncio.gather(*(evaluate(item) for item in items))
+    
+    async def evaluate_answer_stream(
+        self,
+        question: str,
+        answer: str,
+        question_type: str = "behavioral",
+        job_context: str = None,
+        session_context: str = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Evaluate an interview answer, yielding fields as they are generated
+        
+        Args:
+            question: The interview question
+            answer: The candidate's answer
+            question_type: Type of question (behavioral, technical, situational)
+            job_context: Additional context about the job (optional)
+            session_context: The session's context from build_session_context(); takes
+                the place of job_context (optional)
+            
+        Yields:
+            (field, value) tuples in the order the model produces them.
+            If the streamed JSON is malformed, the fields recovered or repaired
+            afterwards follow. Pass the collected fields to complete_evaluation().
+        """
+        
+        parser = JSONObjectStreamParser()
+        content = []
+        sent = set()
+        malformed = False
+        
+        try:
+            # Until the stream opens; the rest overlaps with sending events
+            with span("llm"):
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(question, answer, question_type, job_context, session_context),
+                    temperature=0.7,
+                    max_tokens=1500,
+                    stream=True,
+                    **response_format(self.model)
+                )
+            
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                content.append(chunk.choices[0].delta.content)
+                if malformed:
+                    continue
+                try:
+                    pairs = parser.feed(chunk.choices[0].delta.content)
+                except ValueError:
+                    # Keep reading; the whole text is recovered or repaired below
+                    malformed = True
+                    continue
+                for field, value in pairs:
+                    if field not in EVALUATION_FIELDS:
+                        continue
+                    # Streamed values skip AnswerEvaluation, so check each one here
+                    value = getattr(EvaluationFields.model_validate({field: value}), field)
+                    if value is not None:
+                        sent.add(field)
+                        yield field, value
+                if parser.done:
+                    break
+            
+            if not parser.done:
+                evaluation = await self.output_parser.parse("evaluation", "".join(content), AnswerEvaluation)
+                for field, value in evaluation.model_dump(exclude_none=True).items():
+                    if field not in sent:
+                        yield field, value
+                    
+        except StructuredOutputError as e:
+            print(f"Unparseable streamed evaluation: {e}")
+        except Exception as e:
+            print(f"Error streaming answer evaluation: {e}")
+    
+    def complete_evaluation(self, evaluation: Dict, answer: str) -> Dict:
+        """
+        Turn the fields collected from evaluate_answer_stream into a full evaluation
+        
+        Args:
+            evaluation: Fields received so far
+            answer: The candidate's answer, used if nothing was received
+            
+        Returns:
+            Dictionary with scores and detailed feedback
+        """
+        if not evaluation:
+            return self._generate_fallback_evaluation(answer)
+        return self._fill_missing_fields(dict(evaluation))
+    
+    @staticmethod
+    def build_session_context(
+        job_title: str,
+        company_name: Optional[str],
+        job_description: str
+    ) -> str:
+        """
+        Build the job summary, skills and rubric shared by a session's evaluations
+        
+        Computed once per session (see crud.evaluation_context) so every
+        evaluation prompt of the session starts with the same text.
+        
+        Args:
+            job_title: Job title
+            company_name: Company name (optional)
+            job_description: Job description, compacted for prompts
+            
+        Returns:
+            Context text for the evaluation prompts
+        """
+        matches = get_skill_matcher().match(job_description)
+        skills = sorted(matches, key=lambda name: -matches[name].count)[:EVALUATION_CONTEXT_SKILLS]
+        
+        lines = [f"Role: {job_title} at {company_name or 'the company'}"]
+        if skills:
+            lines.append(f"Key skills: {', '.join(skills)}")
+        lines.append(f"\nJob summary:\n{job_description}")
+        lines.append(
+            "\nFor this role, credit answers that show concrete experience with the key skills "
+            "and the responsibilities above, and note where an answer misses an obvious chance to."
+        )
+        return "\n".join(lines)
+    
+    def _build_messages(
+        self,
+        question: str,
+        answer: str,
+        question_type: str,
+        job_context: str,
+        session_context: str = None
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for an evaluation request
+        
+        The system message (instructions, then session context) is the same
+        for every answer of a session; the question and answer come last.
+        """
+        
+        system = EVALUATION_INSTRUCTIONS
+        if session_context:
+            system += f"\n\nThe candidate is interviewing for this job:\n{session_context}"
+        elif job_context:
+            system += f"\n\nJob Context: {job_context}"
+        
+        prompt = f"""Question Type: {question_type}
+Question: {question}
+
+Candidate's Answer:
+{answer}
+"""
+        
+        return [
+            {
+                "role": "system",
+                "content": system
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _fill_missing_fields(self, evaluation: Dict) -> Dict:
+        """
+        Validate the fields and ensure all required ones exist
+        
+        Scores are clamped to 0-100 and feedback turned into text; values that
+        cannot be used count as missing. A missing score is estimated from the scores that were returned: the
+        overall score is the mean of the sub-scores, and a missing sub-score
+        is the mean of the others (or the overall score if there are none).
+        Only when no score came back at all is DEFAULT_SCORE used.
+        """
+        evaluation = EvaluationFields.model_validate(evaluation).model_dump(exclude_none=True)
+        scores = {field: evaluation[field] for field in SCORE_FIELDS if field in evaluation}
+        sub_scores = [scores[field] for field in SUB_SCORE_FIELDS if field in scores]
+        
+        if not scores:
+            self.output_parser.record_default_scores("evaluation")
+            estimate = DEFAULT_SCORE
+        elif sub_scores:
+            estimate = sum(sub_scores) / len(sub_scores)
+        else:
+            estimate = scores['overall_score']
+        
+        for field in EVALUATION_FIELDS:
+            if field not in evaluation:
+                if field in SCORE_FIELDS:
+                    evaluation[field] = estimate
+                else:
+                    evaluation[field] = "Not available"
+        
+        return evaluation
+    
     def _generate_fallback_evaluation(self, answer: str) -> Dict:
         """Generate a basic evaluation if API fails"""
         
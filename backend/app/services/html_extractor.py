@@ -0,0 +1,215 @@
+from bs4 import BeautifulSoup
+from typing import Callable, Dict, List, Optional
+from dotenv import load_dotenv
+import os
+import re
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+load_dotenv()
+
+HTML_EXTRACTOR = os.getenv("HTML_EXTRACTOR", "auto")  # auto, selectolax, lxml, bs4
+
+JOB_TITLE_CLASS = re.compile(r'job.*title|title.*job', re.I)
+COMPANY_CLASS = re.compile(r'company.*name|employer', re.I)
+META_PROPERTIES = ("og:title", "og:site_name")
+SKIPPED_TAGS = ("script", "style")
+
+class ExtractedPage:
+    """Everything JobParser needs from a page, gathered in one pass"""
+
+    def __init__(self):
+        self.text = ""  # Visible text, not yet whitespace-normalized
+        self.title: Optional[str] = None  # <title>
+        self.job_title: Optional[str] = None  # First h1/h2 with a job title class
+        self.company_name: Optional[str] = None  # First element with a company class
+        self.meta: Dict[str, Optional[str]] = {}  # og: meta content by property
+
+def _class_matches(pattern: re.Pattern, class_attr: Optional[str]) -> bool:
+    """Match a class attribute the way BeautifulSoup's class_ filter does"""
+    if not class_attr:
+        return False
+    return any(pattern.search(c) for c in class_attr.split()) or bool(pattern.search(class_attr))
+
+class HTMLExtractor:
+    """Base class for HTML extraction engines"""
+
+    name = "base"
+
+    def extract(self, content: bytes) -> ExtractedPage:
+        """
+        Extract title candidates, og: meta tags and visible text from HTML
+
+        Args:
+            content: Raw HTML as downloaded
+
+        Returns:
+            The extracted page
+        """
+        raise NotImplementedError
+
+    def _visit(self, page: ExtractedPage, tag: str, attrs: Dict[str, Optional[str]], text: Callable[[], str]) -> None:
+        """Record a single element; text() returns its visible text"""
+        if tag == "title":
+            if page.title is None:
+                page.title = text() or None
+        elif tag == "meta":
+            prop = attrs.get("property")
+            if prop in META_PROPERTIES and prop not in page.meta:
+                page.meta[prop] = attrs.get("content")
+
+        class_attr = attrs.get("class")
+        if not class_attr:
+            return
+        if page.job_title is None and tag in ("h1", "h2") and _class_matches(JOB_TITLE_CLASS, class_attr):
+            page.job_title = text().strip()
+        if page.company_name is None and _class_matches(COMPANY_CLASS, class_attr):
+            page.company_name = text().strip()
+
+class SoupExtractor(HTMLExtractor):
+    """BeautifulSoup with the pure-Python html.parser; always available"""
+
+    name = "bs4"
+
+    def extract(self, content: bytes) -> ExtractedPage:
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # Remove script and style elements
+        for script in soup(SKIPPED_TAGS):
+            script.decompose()
+
+        page = ExtractedPage()
+        page.text = soup.get_text()
+        if soup.title:
+            page.title = soup.title.string
+
+        title_tag = soup.find(['h1', 'h2'], class_=JOB_TITLE_CLASS)
+        if title_tag:
+            page.job_title = title_tag.get_text().strip()
+
+        company_tag = soup.find(class_=COMPANY_CLASS)
+        if company_tag:
+            page.company_name = company_tag.get_text().strip()
+
+        for prop in META_PROPERTIES:
+            meta = soup.find('meta', property=prop)
+            if meta:
+                page.meta[prop] = meta.get('content')
+
+        return page
+
+class LxmlExtractor(HTMLExtractor):
+    """lxml (libxml2) parser with a single walk over the tree"""
+
+    name = "lxml"
+
+    def extract(self, content: bytes) -> ExtractedPage:
+        page = ExtractedPage()
+        if not content or not content.strip():
+            return page
+
+        root = lxml_html.document_fromstring(content)
+        parts: List[str] = []
+        self._walk(root, parts, page)
+        page.text = "".join(parts)
+        return page
+
+    def _walk(self, root, parts: List[str], page: Optional[ExtractedPage] = None) -> None:
+        # Explicit stack: deeply nested pages would exceed the recursion limit.
+        # Comments have no text of their own but their tail is page text.
+        stack = [(root, False)]
+        while stack:
+            element, closing = stack.pop()
+            if closing:
+                if element.tail and element is not root:
+                    parts.append(element.tail)
+                continue
+
+            stack.append((element, True))
+            tag = element.tag
+            if not isinstance(tag, str) or tag in SKIPPED_TAGS:
+                continue
+            if page is not None:
+                self._visit(page, tag, element.attrib, lambda element=element: self._text(element))
+            if element.text:
+                parts.append(element.text)
+            stack.extend((child, False) for child in reversed(element))
+
+    def _text(self, element) -> str:
+        parts: List[str] = []
+        self._walk(element, parts)
+        return "".join(parts)
+
+class SelectolaxExtractor(HTMLExtractor):
+    """selectolax's lexbor parser (C), walking the tree once"""
+
+    name = "selectolax"
+
+    def extract(self, content: bytes) -> ExtractedPage:
+        page = ExtractedPage()
+        tree = LexborHTMLParser(content)
+        if tree.root is None:
+            return page
+
+        parts: List[str] = []
+        for node in tree.root.traverse(include_text=True):
+            tag = node.tag
+            if tag == "-text":
+                if node.parent is not None and node.parent.tag not in SKIPPED_TAGS:
+                    parts.append(node.text(deep=False))
+            elif tag[0] not in "-_":  # Skip comments and the document node
+                self._visit(page, tag, node.attributes, lambda node=node: self._text(node))
+        page.text = "".join(parts)
+        return page
+
+    def _text(self, node) -> str:
+        return "".join(
+            child.text(deep=False) for child in node.traverse(include_text=True)
+            if child.tag == "-text" and child.parent.tag not in SKIPPED_TAGS
+        )
+
+EXTRACTORS = {
+    "selectolax": (SelectolaxExtractor, LexborHTMLParser is not None),
+    "lxml": (LxmlExtractor, lxml_html is not None),
+    "bs4": (SoupExtractor, True),
+}
+
+def available_extractors() -> List[str]:
+    """Names of the engines whose parser is installed, fastest first"""
+    return [name for name, (_, installed) in EXTRACTORS.items() if installed]
+
+def create_html_extractor(name: str) -> HTMLExtractor:
+    """
+    Create an extraction engine by name
+
+    Args:
+        name: selectolax, lxml, bs4, or auto for the fastest installed one
+
+    Returns:
+        The extractor
+    """
+    if name == "auto":
+        name = available_extractors()[0]
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown HTML_EXTRACTOR: {name}")
+    extractor_class, installed = EXTRACTORS[name]
+    if not installed:
+        raise ValueError(f"HTML_EXTRACTOR={name} but its parser is not installed")
+    return extractor_class()
+
+_extractor: Optional[HTMLExtractor] = None
+
+def get_html_extractor() -> HTMLExtractor:
+    """Get the process-wide extractor selected by HTML_EXTRACTOR"""
+    global _extractor
+    if _extractor is None:
+        _extractor = create_html_extractor(HTML_EXTRACTOR)
+    return _extractor
@@ -0,0 +1,233 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+import asyncio
+import httpx
+import os
+import threading
+
+load_dotenv()
+
+HTTP_FETCH_TIMEOUT_SECONDS = float(os.getenv("HTTP_FETCH_TIMEOUT_SECONDS", "10"))
+HTTP_FETCH_MAX_BYTES = int(os.getenv("HTTP_FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "4"))
+HTTP_MAX_TRACKED_HOSTS = int(os.getenv("HTTP_MAX_TRACKED_HOSTS", "256"))
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+)
+
+class ResponseTooLarge(ValueError):
+    """Raised when a response body exceeds the configured size cap"""
+
+class FetchedPage:
+    """Result of fetching a URL"""
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        content: Optional[bytes] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def not_modified(self) -> bool:
+        """True when a conditional request was answered with 304"""
+        return self.status_code == 304
+
+_limits = httpx.Limits(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_CONNECTIONS
+)
+_client_options = dict(
+    headers={"User-Agent": HTTP_USER_AGENT},
+    timeout=HTTP_FETCH_TIMEOUT_SECONDS,
+    limits=_limits,
+    follow_redirects=True
+)
+
+HostSemaphore = Union[asyncio.Semaphore, threading.BoundedSemaphore]
+
+class HostLimits:
+    """
+    Per-host semaphores for the most recently used hosts
+
+    Job URLs come from users, so the set of hosts is unbounded. Once more than
+    max_hosts are tracked, the least recently used hosts that no request is
+    holding or waiting on are dropped; a dropped host simply gets a fresh
+    semaphore next time.
+    """
+
+    def __init__(self, factory: Callable[[], HostSemaphore], max_hosts: int = HTTP_MAX_TRACKED_HOSTS):
+        self._factory = factory
+        self._max_hosts = max_hosts
+        self._lock = threading.Lock()
+        # host -> [semaphore, requests holding or waiting on it]
+        self._hosts: "OrderedDict[str, List]" = OrderedDict()
+
+    @contextmanager
+    def reserve(self, host: str) -> Iterator[HostSemaphore]:
+        """
+        Get the host's semaphore, keeping it tracked until the block exits
+
+        Example:
+            with _async_host_limits.reserve(host) as host_limit:
+                async with host_limit:
+                    ...
+        """
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None:
+                entry = self._hosts[host] = [self._factory(), 0]
+            else:
+                self._hosts.move_to_end(host)
+            entry[1] += 1
+            self._evict()
+        try:
+            yield entry[0]
+        finally:
+            with self._lock:
+                entry[1] -= 1
+
+    def _evict(self) -> None:
+        excess = len(self._hosts) - self._max_hosts
+        if excess <= 0:
+            return
+        idle = [host for host, (_, users) in self._hosts.items() if users == 0][:excess]
+        for host in idle:
+            del self._hosts[host]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+_async_host_limits = HostLimits(lambda: asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST))
+_sync_host_limits = HostLimits(lambda: threading.BoundedSemaphore(HTTP_MAX_CONNECTIONS_PER_HOST))
+_sync_lock = threading.Lock()
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient used for outbound page fetches"""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(**_client_options)
+    return _async_client
+
+def get_sync_http_client() -> httpx.Client:
+    """Get the shared Client for callers that cannot await"""
+    global _sync_client
+    with _sync_lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(**_client_options)
+    return _sync_client
+
+async def close_http_clients() -> None:
+    """Close the shared clients and their connection pools"""
+    global _async_client, _sync_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    with _sync_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+    _async_host_limits.clear()
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+def _request_headers(etag: Optional[str], last_modified: Optional[str]) -> Dict[str, str]:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+def _check_declared_length(response: httpx.Response, max_bytes: int) -> None:
+    declared = response.headers.get("Content-Length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ResponseTooLarge(f"Response is {declared} bytes, limit is {max_bytes}")
+
+def _fetched_page(response: httpx.Response, content: Optional[bytes]) -> FetchedPage:
+    return FetchedPage(
+        url=str(response.url),
+        status_code=response.status_code,
+        content=content,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified")
+    )
+
+async def fetch(
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    max_bytes: int = HTTP_FETCH_MAX_BYTES
+) -> FetchedPage:
+    """
+    Fetch a URL on the shared client, streaming the body under a size cap
+
+    Args:
+        url: URL to fetch
+        etag: ETag from a previous fetch, sent as If-None-Match
+        last_modified: Last-Modified from a previous fetch, sent as If-Modified-Since
+        max_bytes: Largest body to accept
+
+    Returns:
+        The fetched page; content is None when the server answered 304
+
+    Raises:
+        ResponseTooLarge: If the body is larger than max_bytes
+        httpx.HTTPError: On connection errors and non-2xx/304 responses
+    """
+    with _async_host_limits.reserve(_host(url)) as host_limit:
+        async with host_limit:
+            client = get_async_http_client()
+            async with client.stream("GET", url, headers=_request_headers(etag, last_modified)) as response:
+                if response.status_code == 304:
+                    return _fetched_page(response, None)
+                response.raise_for_status()
+                _check_declared_length(response, max_bytes)
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) > max_bytes:
+                        raise ResponseTooLarge(f"Response exceeds {max_bytes} bytes")
+                return _fetched_page(response, bytes(body))
+
+def fetch_sync(
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    max_bytes: int = HTTP_FETCH_MAX_BYTES
+) -> FetchedPage:
+    """Blocking counterpart of fetch(), on the shared sync client"""
+    with _sync_host_limits.reserve(_host(url)) as host_limit, host_limit:
+        client = get_sync_http_client()
+        with client.stream("GET", url, headers=_request_headers(etag, last_modified)) as response:
+            if response.status_code == 304:
+                return _fetched_page(response, None)
+            response.raise_for_status()
+            _check_declared_length(response, max_bytes)
+
+            body = bytearray()
+            for chunk in response.iter_bytes():
+                body += chunk
+                if len(body) > max_bytes:
+                    raise ResponseTooLarge(f"Response exceeds {max_bytes} bytes")
+            return _fetched_page(response, bytes(body))
@@ -1,10 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
+from fastapi.concurrency import run_in_threadpool
 from PyPDF2 import PdfReader
 from typing import Optional, Dict
+from dotenv import load_dotenv
 import io
+import os
 import re
 
+from .html_extractor import ExtractedPage, HTMLExtractor, get_html_extractor
+from .http_client import FetchedPage, fetch, fetch_sync
+from .pdf_extractor import PDFTooLarge, extract_pdf_text
+from .skill_matcher import SkillMatch, get_skill_matcher
+from .structured_data import extract_job_posting
+from ..timing import span
+
+load_dotenv()
+
+# Prompts use a compacted, token-budgeted copy, so keep enough for compaction to choose from
+JOB_DESCRIPTION_MAX_CHARS = int(os.getenv("JOB_DESCRIPTION_MAX_CHARS", "20000"))
+
 class JobParser:
     """Service for parsing job descriptions from various sources"""
     
@@ -13,6 +26,8 @@ class JobParser:
         """
         Parse job description from a URL
         
+        Blocking; async callers should use parse_from_url_async.
+        
         Args:
             url: URL of the job posting
             
@@ -20,41 +35,87 @@ class JobParser:
             Dictionary with parsed job information
         """
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text
-            text = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Try to extract job title
-            job_title = JobParser._extract_job_title(soup, text)
+            page = fetch_sync(url)
+            return JobParser._parse_page(page, url)
+        except Exception as e:
+            raise ValueError(f"Failed to parse URL: {str(e)}")
+    
+    @staticmethod
+    async def parse_from_url_async(url: str) -> Dict[str, str]:
+        """
+        Parse job description from a URL without blocking the event loop
+        
+        The page is downloaded on the shared async HTTP client and parsed
+        in the threadpool.
+        
+        Args:
+            url: URL of the job posting
             
-            # Try to extract company name
-            company_name = JobParser._extract_company_name(soup, text)
+        Returns:
+            Dictionary with parsed job information
+        """
+        try:
+            with span("fetch"):
+                page = await fetch(url)
+            return await run_in_threadpool(JobParser._parse_page, page, url)
+        except Exception as e:
+            raise ValueError(f"Failed to parse URL: {str(e)}")
+    
+    @staticmethod
+    def _parse_page(page: FetchedPage, url: str) -> Dict[str, str]:
+        """Parse a fetched page, keeping its cache validators"""
+        with span("parse"):
+            parsed = JobParser.parse_html(page.content, url)
+        parsed["etag"] = page.etag
+        parsed["last_modified"] = page.last_modified
+        return parsed
+    
+    @staticmethod
+    def parse_html(
+        content: bytes,
+        url: str,
+        extractor: Optional[HTMLExtractor] = None,
+        structured_data: bool = True
+    ) -> Dict[str, str]:
+        """
+        Parse job description from the HTML of a job posting
+        
+        Args:
+            content: Raw HTML as downloaded
+            url: URL the HTML was fetched from
+            extractor: Extraction engine; defaults to the one selected by HTML_EXTRACTOR
+            structured_data: Use embedded JSON-LD JobPosting data when present
             
+        Returns:
+            Dictionary with parsed job information
+        """
+        # Most job boards embed a schema.org JobPosting; when it is there,
+        # skip parsing the page altogether
+        posting = extract_job_posting(content) if structured_data else None
+        if posting is not None:
             return {
-                "job_title": job_title,
-                "company_name": company_name,
-                "job_description": text[:5000],  # Limit to 5000 chars
+                "job_title": posting["title"],
+                "company_name": posting["company_name"],
+                "job_description": JobParser._clean_text(posting["description"])[:JOB_DESCRIPTION_MAX_CHARS],
                 "source_url": url
             }
-            
-        except Exception as e:
-            raise ValueError(f"Failed to parse URL: {str(e)}")
+        
+        # Title candidates, meta tags and visible text in one pass
+        page = (extractor or get_html_extractor()).extract(content)
+        text = JobParser._clean_text(page.text)
+        
+        # Try to extract job title
+        job_title = JobParser._extract_job_title(page)
+        
+        # Try to extract company name
+        company_name = JobParser._extract_company_name(page)
+        
+        return {
+            "job_title": job_title,
+            "company_name": company_name,
+            "job_description": text[:JOB_DESCRIPTION_MAX_CHARS],
+            "source_url": url
+        }
     
     @staticmethod
     def parse_from_pdf(pdf_content: bytes) -> str:
@@ -71,50 +132,74 @@ class JobParser:
             pdf_file = io.BytesIO(pdf_content)
             pdf_reader = PdfReader(pdf_file)
             
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+            pages = [page.extract_text() or "" for page in pdf_reader.pages]
+            return "\n".join(pages).strip()
             
-            return text.strip()
+        except Exception as e:
+            raise ValueError(f"Failed to parse PDF: {str(e)}")
+    
+    @staticmethod
+    async def parse_from_pdf_file(path: str) -> str:
+        """
+        Parse job description from a PDF file without blocking the event loop
+        
+        Large documents are extracted in parallel across worker processes.
+        
+        Args:
+            path: PDF file on disk
             
+        Returns:
+            Extracted text from PDF
+            
+        Raises:
+            PDFTooLarge: If the PDF has more pages than PDF_MAX_PAGES
+            ValueError: If the PDF cannot be parsed
+        """
+        try:
+            with span("pdf"):
+                return await extract_pdf_text(path)
+        except PDFTooLarge:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to parse PDF: {str(e)}")
     
     @staticmethod
-    def _extract_job_title(soup: BeautifulSoup, text: str) -> str:
+    def _clean_text(text: str) -> str:
+        """Collapse whitespace and drop empty lines, keeping one block per line"""
+        lines = (' '.join(line.split()) for line in text.splitlines())
+        return '\n'.join(line for line in lines if line)
+    
+    @staticmethod
+    def _extract_job_title(page: ExtractedPage) -> str:
         """Extract job title from HTML"""
         # Try common job title tags
-        title_tags = soup.find_all(['h1', 'h2'], class_=re.compile(r'job.*title|title.*job', re.I))
-        if title_tags:
-            return title_tags[0].get_text().strip()
+        if page.job_title is not None:
+            return page.job_title
         
         # Try meta tags
-        meta_title = soup.find('meta', property='og:title')
-        if meta_title and meta_title.get('content'):
-            return meta_title['content'].strip()
+        meta_title = page.meta.get('og:title')
+        if meta_title:
+            return meta_title.strip()
         
         # Try page title
-        if soup.title:
-            title = soup.title.string
-            if title:
-                # Remove common suffixes
-                title = re.sub(r'\s*[-|]\s*(Jobs?|Careers?|Indeed|LinkedIn).*$', '', title, flags=re.I)
-                return title.strip()
+        if page.title:
+            # Remove common suffixes
+            title = re.sub(r'\s*[-|]\s*(Jobs?|Careers?|Indeed|LinkedIn).*$', '', page.title, flags=re.I)
+            return title.strip()
         
         return "Unknown Position"
     
     @staticmethod
-    def _extract_company_name(soup: BeautifulSoup, text: str) -> Optional[str]:
+    def _extract_company_name(page: ExtractedPage) -> Optional[str]:
         """Extract company name from HTML"""
         # Try common company name tags
-        company_tags = soup.find_all(class_=re.compile(r'company.*name|employer', re.I))
-        if company_tags:
-            return company_tags[0].get_text().strip()
+        if page.company_name is not None:
+            return page.company_name
         
         # Try meta tags
-        meta_company = soup.find('meta', property='og:site_name')
-        if meta_company and meta_company.get('content'):
-            return meta_company['content'].strip()
+        meta_company = page.meta.get('og:site_name')
+        if meta_company:
+            return meta_company.strip()
         
         return None
     
@@ -127,19 +212,20 @@ class JobParser:
             job_description: Job description text
             
         Returns:
-            List of extracted skills
+            List of canonical skill names, most mentioned first
+        """
+        matches = JobParser.match_skills(job_description)
+        return sorted(matches, key=lambda name: -matches[name].count)
+    
+    @staticmethod
+    def match_skills(job_description: str) -> Dict[str, SkillMatch]:
+        """
+        Find skills from the SKILLS_FILE dictionary, resolving aliases
+        
+        Args:
+            job_description: Job description text
+            
+        Returns:
+            Occurrence counts and offsets by canonical skill name
         """
-        # Common skill keywords
-        skill_patterns = [
-            r'\b(Python|Java|JavaScript|TypeScript|React|Angular|Vue|Node\.js|Django|Flask|FastAPI)\b',
-            r'\b(SQL|PostgreSQL|MySQL|MongoDB|Redis|Docker|Kubernetes|AWS|Azure|GCP)\b',
-            r'\b(Git|CI/CD|Agile|Scrum|REST|API|GraphQL|Microservices)\b',
-            r'\b(Machine Learning|AI|Data Science|Analytics|TensorFlow|PyTorch)\b',
-        ]
-        
-        skills = set()
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, job_description, re.IGNORECASE)
-            skills.update(match.lower() for match in matches)
-        
-        return list(skills)
+        return get_skill_matcher().match(job_description)
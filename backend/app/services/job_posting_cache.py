@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
+import hashlib
+import os
+
+from ..database import new_async_session
+from .. import models
+from .http_client import fetch
+from .job_parser import JobParser
+from .llm_cache import MemoryLRUCache
+
+load_dotenv()
+
+JOB_POSTING_CACHE_TTL_SECONDS = int(os.getenv("JOB_POSTING_CACHE_TTL_SECONDS", str(24 * 3600)))
+JOB_POSTING_CACHE_MAX_ENTRIES = int(os.getenv("JOB_POSTING_CACHE_MAX_ENTRIES", "500"))
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "trk", "trackingid", "refid"}
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_job_url(url: str) -> str:
+    """
+    Normalize a job posting URL for use as a cache key
+
+    Lowercases the scheme and host, drops default ports, fragments,
+    trailing slashes and tracking parameters, and sorts the query string.
+
+    Args:
+        url: URL as submitted by the user
+
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+class JobPostingCache:
+    """
+    Parsed job postings by normalized URL
+
+    An in-process LRU sits in front of the job_postings table. Once an
+    entry's TTL has passed it is revalidated rather than refetched blindly:
+    a conditional request (ETag/Last-Modified) that returns 304, or a page
+    whose SHA-256 matches the stored one, only extends the entry. The page
+    is parsed again only when its content actually changed.
+    """
+
+    def __init__(self, ttl_seconds: int = JOB_POSTING_CACHE_TTL_SECONDS, max_entries: int = JOB_POSTING_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.memory = MemoryLRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.db_hits = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.parsed = 0
+
+    async def get_or_parse(self, url: str) -> Dict[str, Any]:
+        """
+        Get the parsed posting for a URL, fetching and parsing only when needed
+
+        Args:
+            url: URL of the job posting
+
+        Returns:
+            Dictionary with parsed job information, as JobParser.parse_from_url
+
+        Raises:
+            ValueError: If the page cannot be fetched or parsed and nothing is cached
+        """
+        key = normalize_job_url(url)
+        now = datetime.utcnow()
+
+        entry = await self.memory.get(key)
+        if entry is not None and entry["expires_at"] > now:
+            return self._result(entry, url)
+
+        entry = await self._load(key)
+        if entry is not None and entry["expires_at"] > now:
+            self.db_hits += 1
+            await self.memory.set(key, entry)
+            return self._result(entry, url)
+
+        try:
+            page = await fetch(
+                url,
+                etag=entry["etag"] if entry else None,
+                last_modified=entry["last_modified"] if entry else None
+            )
+        except Exception as e:
+            if entry is not None:
+                # Serve the stale posting rather than fail the request
+                print(f"Error revalidating job posting {key}: {e}")
+                return self._result(entry, url)
+            raise ValueError(f"Failed to parse URL: {str(e)}")
+
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        if entry is not None and page.not_modified:
+            self.not_modified += 1
+            entry.update(expires_at=expires_at)
+        else:
+            content_hash = hashlib.sha256(page.content).hexdigest()
+            if entry is not None and entry["content_hash"] == content_hash:
+                self.unchanged += 1
+            else:
+                try:
+                    parsed = await run_in_threadpool(JobParser.parse_html, page.content, url)
+                except Exception as e:
+                    raise ValueError(f"Failed to parse URL: {str(e)}")
+                self.parsed += 1
+                entry = {
+                    "job_title": parsed["job_title"],
+                    "company_name": parsed["company_name"],
+                    "job_description": parsed["job_description"]
+                }
+            entry.update(
+                etag=page.etag,
+                last_modified=page.last_modified,
+                content_hash=content_hash,
+                expires_at=expires_at
+            )
+
+        await self._store(key, entry)
+        await self.memory.set(key, entry)
+        return self._result(entry, url)
+
+    @staticmethod
+    def _result(entry: Dict[str, Any], url: str) -> Dict[str, Any]:
+        return {
+            "job_title": entry["job_title"],
+            "company_name": entry["company_name"],
+            "job_description": entry["job_description"],
+            "source_url": url,
+            "etag": entry["etag"],
+            "last_modified": entry["last_modified"]
+        }
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        db = new_async_session()
+        try:
+            row = await db.get(models.JobPosting, key)
+            if row is None:
+                return None
+            return {
+                "job_title": row.job_title,
+                "company_name": row.company_name,
+                "job_description": row.job_description,
+                "etag": row.etag,
+                "last_modified": row.last_modified,
+                "content_hash": row.content_hash,
+                "expires_at": row.expires_at
+            }
+        except Exception as e:
+            print(f"Error reading job posting cache entry: {e}")
+            return None
+        finally:
+            await db.close()
+
+    async def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        db = new_async_session()
+        try:
+            row = await db.get(models.JobPosting, key)
+            if row is None:
+                row = models.JobPosting(url=key)
+                db.add(row)
+            for field, value in entry.items():
+                setattr(row, field, value)
+            row.fetched_at = datetime.utcnow()
+            await db.commit()
+        except Exception as e:
+            # e.g. a concurrent request stored the same URL first
+            await db.rollback()
+            print(f"Error writing job posting cache entry: {e}")
+        finally:
+            await db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit counters for each tier"""
+        return {
+            "memory": self.memory.stats(),
+            "db_hits": self.db_hits,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "parsed": self.parsed
+        }
+
+_cache: Optional[JobPostingCache] = None
+
+def get_job_posting_cache() -> JobPostingCache:
+    """Get the process-wide job posting cache"""
+    global _cache
+    if _cache is None:
+        _cache = JobPostingCache()
+    return _cache
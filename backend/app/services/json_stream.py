@@ -0,0 +1,80 @@
+from typing import Any, List, Tuple
+import json
+
+_WHITESPACE = " \t\r\n"
+
+class JSONObjectStreamParser:
+    """
+    Incremental parser for a streamed top-level JSON object
+
+    Text is fed in arbitrary chunks; every key/value pair of the top-level
+    object is returned as soon as its value is complete, without waiting for
+    the closing brace. Anything before the opening brace (such as a Markdown
+    code fence) is ignored.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of text and return the pairs it completed
+
+        Args:
+            chunk: Next piece of the streamed response
+
+        Returns:
+            List of (key, value) tuples completed by this chunk, in order
+        """
+        self._buffer += chunk
+        pairs = []
+
+        if not self._started:
+            start = self._buffer.find("{", self._pos)
+            if start == -1:
+                self._pos = len(self._buffer)
+                return pairs
+            self._pos = start + 1
+            self._started = True
+
+        while not self.done:
+            pos = self._skip(self._pos, _WHITESPACE + ",")
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == "}":
+                self.done = True
+                self._pos = pos + 1
+                break
+
+            try:
+                key, pos = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                break
+            pos = self._skip(pos, _WHITESPACE)
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] != ":":
+                raise ValueError(f"Expected ':' after key {key!r}")
+            pos = self._skip(pos + 1, _WHITESPACE)
+
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                break
+            # A number at the end of the buffer may still be growing ("8" -> "85")
+            if isinstance(value, (int, float)) and end >= len(self._buffer):
+                break
+
+            pairs.append((key, value))
+            self._pos = end
+
+        return pairs
+
+    def _skip(self, pos: int, chars: str) -> int:
+        while pos < len(self._buffer) and self._buffer[pos] in chars:
+            pos += 1
+        return pos
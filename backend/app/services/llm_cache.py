@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+from sqlalchemy import delete, or_, select
+import copy
+import hashlib
+import json
+import os
+import re
+import time
+
+from ..database import new_async_session
+from .. import models
+
+load_dotenv()
+
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory, sql, none
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+
+class LLMCache:
+    """Base class for LLM response caches, keyed by a hash of the request"""
+
+    backend = "none"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(**params) -> str:
+        """
+        Build a content-addressed cache key from request parameters
+
+        Message contents are whitespace-normalized so that cosmetic
+        differences in a pasted job posting do not produce a new entry.
+
+        Args:
+            **params: Model name, sampling parameters and messages
+
+        Returns:
+            Hex SHA-256 digest of the normalized parameters
+        """
+        normalized = dict(params)
+        if "messages" in normalized:
+            normalized["messages"] = [
+                {**m, "content": re.sub(r"\s+", " ", m.get("content", "")).strip()}
+                for m in normalized["messages"]
+            ]
+        payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key"""
+        await self._set(key, value)
+
+    async def _get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def _set(self, key: str, value: Any) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for this cache"""
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None
+        }
+
+class MemoryLRUCache(LLMCache):
+    """In-process LRU cache with TTL and size-based eviction"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl_seconds: int = LLM_CACHE_TTL_SECONDS):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def _get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    async def _set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "size": len(self._entries)}
+
+class SQLCache(LLMCache):
+    """Persistent cache stored in the llm_cache table, shared by all workers"""
+
+    backend = "sql"
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl_seconds: int = LLM_CACHE_TTL_SECONDS):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+    async def _get(self, key: str) -> Optional[Any]:
+        db = new_async_session()
+        try:
+            entry = await db.get(models.LLMCacheEntry, key)
+            if entry is None:
+                return None
+            now = datetime.utcnow()
+            if entry.expires_at < now:
+                await db.delete(entry)
+                await db.commit()
+                return None
+            entry.accessed_at = now
+            value = json.loads(entry.value)
+            await db.commit()
+            return value
+        except Exception as e:
+            await db.rollback()
+            print(f"Error reading LLM cache entry: {e}")
+            return None
+        finally:
+            await db.close()
+
+    async def _set(self, key: str, value: Any) -> None:
+        db = new_async_session()
+        try:
+            now = datetime.utcnow()
+            entry = await db.get(models.LLMCacheEntry, key)
+            if entry is None:
+                entry = models.LLMCacheEntry(key=key)
+                db.add(entry)
+            entry.value = json.dumps(value)
+            entry.created_at = now
+            entry.accessed_at = now
+            entry.expires_at = now + timedelta(seconds=self.ttl_seconds)
+            await db.flush()
+
+            # Evict expired entries and everything past the most recently used max_entries
+            recent_keys = select(models.LLMCacheEntry.key).order_by(
+                models.LLMCacheEntry.accessed_at.desc()
+            ).limit(self.max_entries)
+            await db.execute(
+                delete(models.LLMCacheEntry).where(or_(
+                    models.LLMCacheEntry.expires_at < now,
+                    models.LLMCacheEntry.key.not_in(recent_keys.scalar_subquery())
+                )).execution_options(synchronize_session=False)
+            )
+
+            await db.commit()
+        except Exception as e:
+            # e.g. a concurrent request stored the same key first
+            await db.rollback()
+            print(f"Error writing LLM cache entry: {e}")
+        finally:
+            await db.close()
+
+_cache: Optional[LLMCache] = None
+
+def get_llm_cache() -> LLMCache:
+    """Get the process-wide LLM response cache selected by LLM_CACHE_BACKEND"""
+    global _cache
+    if _cache is None:
+        if LLM_CACHE_BACKEND == "memory":
+            _cache = MemoryLRUCache()
+        elif LLM_CACHE_BACKEND == "sql":
+            _cache = SQLCache()
+        elif LLM_CACHE_BACKEND == "none":
+            _cache = LLMCache()
+        else:
+            raise ValueError(f"Unknown LLM_CACHE_BACKEND: {LLM_CACHE_BACKEND}")
+    return _cache
@@ -0,0 +1,44 @@
+from openai import AsyncOpenAI
+import os
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+# Any OpenAI-compatible endpoint, e.g. scripts/mock_openai_server.py for load tests
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+_client: Optional[AsyncOpenAI] = None
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    Get the shared AsyncOpenAI client
+
+    All services share one client so that they also share one HTTP
+    connection pool; requests awaiting OpenAI do not hold a worker thread.
+
+    Returns:
+        The process-wide AsyncOpenAI client
+    """
+    global _client
+    if _client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
+        _client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=OPENAI_BASE_URL,
+            timeout=OPENAI_TIMEOUT_SECONDS,
+            max_retries=OPENAI_MAX_RETRIES
+        )
+    return _client
+
+async def close_async_client() -> None:
+    """Close the shared client and its connection pool"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,307 @@
+from sqlalchemy import or_, select, update
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+import asyncio
+import os
+
+from .. import crud, models, schemas
+from ..database import AnySession, new_async_session
+from .answer_evaluator import AnswerEvaluator
+from .question_generator import QuestionGenerator
+
+load_dotenv()
+
+# Queue mode: LLM endpoints enqueue a job and return 202; python -m app.worker runs it
+LLM_JOB_QUEUE = os.getenv("LLM_JOB_QUEUE", "false").lower() == "true"
+# How long a job stays leased to a worker that stopped renewing it (crashed) before
+# another worker may take it over; running workers renew every third of this
+LLM_JOB_LEASE_SECONDS = int(os.getenv("LLM_JOB_LEASE_SECONDS", "300"))
+LLM_JOB_MAX_ATTEMPTS = int(os.getenv("LLM_JOB_MAX_ATTEMPTS", "3"))
+LLM_JOB_RETRY_DELAY_SECONDS = int(os.getenv("LLM_JOB_RETRY_DELAY_SECONDS", "10"))
+
+JOB_KINDS = ("generate_questions", "evaluate_answer", "evaluate_answers")
+FINISHED_STATUSES = ("succeeded", "failed")
+
+class JobFailed(Exception):
+    """A job that cannot succeed however often it is retried"""
+
+async def enqueue_job(
+    db: AnySession,
+    user_id: int,
+    session_id: int,
+    kind: str,
+    payload: Dict[str, Any]
+) -> models.LLMJob:
+    """
+    Add a job to the queue
+
+    The job is flushed but not committed; it becomes visible to workers when
+    the caller commits.
+
+    Args:
+        db: Database session
+        user_id: Owner of the job
+        session_id: Interview session the job works on
+        kind: One of JOB_KINDS
+        payload: Request body for the job's handler
+
+    Returns:
+        The queued job
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = models.LLMJob(
+        user_id=user_id,
+        session_id=session_id,
+        kind=kind,
+        status="queued",
+        payload=payload,
+        attempts=0
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+async def claim_job(db: AnySession) -> Optional[models.LLMJob]:
+    """
+    Take the oldest claimable job and lease it to this worker
+
+    Queued jobs past their retry delay and running jobs whose lease expired
+    (their worker died) are claimable, up to LLM_JOB_MAX_ATTEMPTS claims;
+    expired jobs past that are failed, so a job that keeps killing its
+    worker is not retried forever. FOR UPDATE SKIP LOCKED lets any number
+    of workers claim concurrently without waiting on each other.
+
+    The claim increments attempts, which then serves as the claim's fencing
+    token: only the worker holding the latest claim can renew the lease or
+    record the outcome (see _finish).
+
+    Returns:
+        The claimed job, committed as running, or None if the queue is empty
+    """
+    now = datetime.utcnow()
+    abandoned = (
+        select(models.LLMJob.id)
+        .filter(
+            models.LLMJob.status == "running",
+            models.LLMJob.locked_until < now,
+            models.LLMJob.attempts >= LLM_JOB_MAX_ATTEMPTS
+        )
+        .with_for_update(skip_locked=True)
+    )
+    await db.execute(
+        update(models.LLMJob)
+        .where(models.LLMJob.id.in_(abandoned))
+        .values(
+            status="failed",
+            error="Worker stopped during the last attempt",
+            locked_until=None,
+            finished_at=now
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    next_job = (
+        select(models.LLMJob.id)
+        .filter(
+            models.LLMJob.status.in_(("queued", "running")),
+            models.LLMJob.attempts < LLM_JOB_MAX_ATTEMPTS,
+            or_(models.LLMJob.locked_until.is_(None), models.LLMJob.locked_until < now)
+        )
+        .order_by(models.LLMJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(models.LLMJob)
+        .where(models.LLMJob.id == next_job)
+        .values(
+            status="running",
+            attempts=models.LLMJob.attempts + 1,
+            started_at=now,
+            locked_until=now + timedelta(seconds=LLM_JOB_LEASE_SECONDS)
+        )
+        .returning(models.LLMJob)
+        .execution_options(synchronize_session=False)
+    )
+    job = result.scalars().first()
+    await db.commit()
+    return job
+
+async def run_job(job: models.LLMJob) -> None:
+    """
+    Run a claimed job and record its outcome
+
+    The lease is renewed while the handler runs. The handler's writes and the
+    job's result are committed together, and only if this is still the
+    job's latest claim; otherwise they are rolled back. Failed jobs are
+    requeued with a delay until LLM_JOB_MAX_ATTEMPTS is reached.
+    """
+    stop = asyncio.Event()
+    renewal = asyncio.create_task(_renew_lease(job.id, job.attempts, stop))
+    db = new_async_session()
+    try:
+        try:
+            session = await db.get(models.InterviewSession, job.session_id)
+            if session is None:
+                raise JobFailed("Session not found")
+            result = await HANDLERS[job.kind](db, session, job.payload)
+        except Exception as e:
+            await db.rollback()
+            retry = not isinstance(e, JobFailed) and job.attempts < LLM_JOB_MAX_ATTEMPTS
+            await _finish(db, job.id, job.attempts, error=str(e), retry=retry)
+            return
+        await _finish(db, job.id, job.attempts, result=result)
+    finally:
+        stop.set()
+        await renewal
+        await db.close()
+
+async def _renew_lease(job_id: int, attempts: int, stop: asyncio.Event) -> None:
+    """Extend a running job's lease every third of LLM_JOB_LEASE_SECONDS until stop is set"""
+    while True:
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=LLM_JOB_LEASE_SECONDS / 3)
+            return
+        except asyncio.TimeoutError:
+            pass
+        db = new_async_session()
+        try:
+            result = await db.execute(
+                update(models.LLMJob)
+                .where(
+                    models.LLMJob.id == job_id,
+                    models.LLMJob.attempts == attempts,
+                    models.LLMJob.status == "running"
+                )
+                .values(locked_until=datetime.utcnow() + timedelta(seconds=LLM_JOB_LEASE_SECONDS))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            if result.rowcount == 0:
+                # Claimed by another worker; _finish will discard this run's outcome
+                return
+        except Exception as e:
+            print(f"Failed to renew lease of job {job_id}: {e}")
+        finally:
+            await db.close()
+
+async def _finish(
+    db: AnySession,
+    job_id: int,
+    attempts: int,
+    result: Any = None,
+    error: Optional[str] = None,
+    retry: bool = False
+) -> bool:
+    """
+    Mark a job succeeded, failed or queued for another attempt, and commit
+
+    Fenced on attempts: if the job was claimed again since this run's claim,
+    nothing is recorded and the transaction, including the handler's
+    writes, is rolled back.
+
+    Returns:
+        Whether the outcome was recorded
+    """
+    now = datetime.utcnow()
+    if retry:
+        values = dict(status="queued", error=error, locked_until=now + timedelta(seconds=LLM_JOB_RETRY_DELAY_SECONDS))
+    else:
+        values = dict(
+            status="failed" if error is not None else "succeeded",
+            result=result,
+            error=error,
+            locked_until=None,
+            finished_at=now
+        )
+    updated = await db.execute(
+        update(models.LLMJob)
+        .where(
+            models.LLMJob.id == job_id,
+            models.LLMJob.attempts == attempts,
+            models.LLMJob.status == "running"
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if updated.rowcount == 0:
+        await db.rollback()
+        print(f"Job {job_id} was claimed again during attempt {attempts}; discarding its outcome")
+        return False
+    await db.commit()
+    return True
+
+async def get_job(db: AnySession, job_id: int, user_id: int) -> Optional[models.LLMJob]:
+    """Load a job, or None if it does not exist or belongs to someone else"""
+    result = await db.execute(select(models.LLMJob).filter(
+        models.LLMJob.id == job_id,
+        models.LLMJob.user_id == user_id
+    ))
+    return result.scalars().first()
+
+# Handlers: the LLM call and the writes of the matching inline endpoint
+
+question_generator = QuestionGenerator()
+answer_evaluator = AnswerEvaluator()
+
+async def _generate_questions(db: AnySession, session: models.InterviewSession, payload: Dict) -> List[Dict]:
+    if await crud.count_questions(db, session.id) > 0:
+        raise JobFailed("Questions already generated for this session")
+
+    crud.evaluation_context(session)
+    questions_data = await question_generator.generate_questions(
+        job_title=session.job_title,
+        job_description=crud.compact_job_description(session),
+        company_name=session.company_name,
+        num_questions=payload.get("num_questions", 5),
+        difficulty=payload.get("difficulty") or "medium"
+    )
+    db_questions = await crud.save_questions(db, session.id, questions_data)
+    return [schemas.QuestionBase.model_validate(q).model_dump(mode="json") for q in db_questions]
+
+async def _evaluate_answers(db: AnySession, session: models.InterviewSession, payload: Dict) -> List[Dict]:
+    answers = payload["answers"]
+    question_ids = [a["question_id"] for a in answers]
+    result = await db.execute(select(models.Question).filter(
+        models.Question.id.in_(question_ids),
+        models.Question.session_id == session.id
+    ))
+    questions = {q.id: q for q in result.scalars().all()}
+    if len(questions) != len(set(question_ids)):
+        raise JobFailed("Question not found")
+
+    session_context = crud.evaluation_context(session)
+    evaluations = await answer_evaluator.evaluate_answers([
+        {
+            "question": questions[a["question_id"]].question_text,
+            "answer": a["answer_text"],
+            "question_type": questions[a["question_id"]].question_type,
+            "session_context": session_context
+        }
+        for a in answers
+    ])
+
+    db_answers = []
+    for a, evaluation in zip(answers, evaluations):
+        db_answers.append(await crud.save_answer_evaluation(
+            db,
+            session=session,
+            question_id=a["question_id"],
+            answer_text=a["answer_text"],
+            evaluation=evaluation
+        ))
+    await crud.update_session_score(db, session)
+    return [schemas.AnswerWithFeedback.model_validate(a).model_dump(mode="json") for a in db_answers]
+
+async def _evaluate_answer(db: AnySession, session: models.InterviewSession, payload: Dict) -> Dict:
+    answers = await _evaluate_answers(db, session, {"answers": [payload]})
+    return answers[0]
+
+HANDLERS = {
+    "generate_questions": _generate_questions,
+    "evaluate_answer": _evaluate_answer,
+    "evaluate_answers": _evaluate_answers,
+}
@@ -0,0 +1,156 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from dotenv import load_dotenv
+from passlib.context import CryptContext
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+
+from ..timing import span
+
+load_dotenv()
+
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # thread, process
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def hash_password(password: str) -> str:
+    """Hash a password (blocking)"""
+    return pwd_context.hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash (blocking)"""
+    return pwd_context.verify(plain_password, hashed_password)
+
+class HashingOverloaded(Exception):
+    """Raised when too many hashing requests are already waiting for a worker"""
+
+class HashingMetrics:
+    """Counters for password hashing work"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latency_seconds_total = 0.0
+        self.latency_seconds_max = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.latency_seconds_total += seconds
+            self.latency_seconds_max = max(self.latency_seconds_max, seconds)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on its own bounded worker pool
+
+    bcrypt spends its time in C with the GIL released, so a dedicated thread
+    pool gives real parallelism without tying up the threadpool that serves
+    sync endpoints and run_in_threadpool calls. A process pool is available
+    for interpreters where that does not hold.
+
+    Requests beyond the worker count wait in the executor queue; once
+    max_pending requests are queued or running, new ones are rejected with
+    HashingOverloaded instead of piling up.
+    """
+
+    def __init__(
+        self,
+        executor: str = PASSWORD_HASH_EXECUTOR,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown PASSWORD_HASH_EXECUTOR: {executor}")
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.metrics = HashingMetrics()
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                # spawn: forking a process that already runs an event loop and threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        metrics = self.metrics
+        with metrics._lock:
+            if metrics.pending >= self.max_pending:
+                metrics.rejected += 1
+                raise HashingOverloaded("Too many password hashing requests in progress")
+            metrics.pending += 1
+
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with metrics._lock:
+                metrics.pending -= 1
+            metrics.record(time.perf_counter() - start)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the hashing pool"""
+        with span("bcrypt"):
+            return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the hashing pool"""
+        with span("bcrypt"):
+            return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get worker pool settings, queue depth and latency counters"""
+        metrics = self.metrics
+        with metrics._lock:
+            pending = metrics.pending
+            return {
+                "executor": self.executor_kind,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_progress": min(pending, self.workers),
+                "queue_depth": max(pending - self.workers, 0),
+                "completed": metrics.completed,
+                "rejected": metrics.rejected,
+                "latency_seconds_total": metrics.latency_seconds_total,
+                "latency_seconds_max": metrics.latency_seconds_max
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+_hasher: Optional[PasswordHasher] = None
+
+def get_password_hasher() -> PasswordHasher:
+    """Get the process-wide password hasher"""
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher()
+    return _hasher
+
+def close_password_hasher() -> None:
+    """Shut down the shared password hasher's workers"""
+    global _hasher
+    if _hasher is not None:
+        _hasher.shutdown()
+        _hasher = None
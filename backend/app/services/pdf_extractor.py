@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from dotenv import load_dotenv
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from PyPDF2 import PdfReader
+import asyncio
+import mmap
+import multiprocessing
+import os
+import tempfile
+
+load_dotenv()
+
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "200"))
+# Smaller documents are extracted in the threadpool; larger ones are split across processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+class PDFTooLarge(ValueError):
+    """Raised when a PDF exceeds the size or page limits"""
+
+async def spool_upload(upload: UploadFile, max_bytes: int = PDF_MAX_BYTES) -> str:
+    """
+    Copy an uploaded PDF to a temporary file, chunk by chunk
+
+    Args:
+        upload: The uploaded file
+        max_bytes: Largest upload to accept
+
+    Returns:
+        Path of the temporary file; the caller deletes it
+
+    Raises:
+        PDFTooLarge: If the upload is larger than max_bytes
+        ValueError: If the upload is not a PDF
+    """
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if size == 0 and not chunk.startswith(b"%PDF-"):
+                    raise ValueError("Uploaded file is not a PDF")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise PDFTooLarge(f"PDF is larger than {max_bytes} bytes")
+                out.write(chunk)
+        if size == 0:
+            raise ValueError("Uploaded file is empty")
+        return path
+    except Exception:
+        os.unlink(path)
+        raise
+
+def count_pages(path: str) -> int:
+    """Count the pages of a PDF file, reading only its cross-reference data"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return len(PdfReader(data).pages)
+
+def extract_pages(path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract the text of pages [start, stop) of a PDF file
+
+    The file is memory-mapped, so only the objects these pages reference
+    are read. Runs in pool worker processes, hence module-level.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        reader = PdfReader(data)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def close_pdf_pool() -> None:
+    """Shut down the PDF extraction worker processes"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+async def extract_pdf_text(path: str, max_pages: int = PDF_MAX_PAGES) -> str:
+    """
+    Extract the text of a PDF file without blocking the event loop
+
+    PyPDF2 is pure Python and holds the GIL, so documents of at least
+    PDF_PARALLEL_MIN_PAGES pages are split into one contiguous page range
+    per worker process.
+
+    Args:
+        path: PDF file on disk
+        max_pages: Largest page count to accept
+
+    Returns:
+        Text of all pages, one page per line block
+
+    Raises:
+        PDFTooLarge: If the document has more than max_pages pages
+    """
+    num_pages = await run_in_threadpool(count_pages, path)
+    if num_pages > max_pages:
+        raise PDFTooLarge(f"PDF has {num_pages} pages, limit is {max_pages}")
+
+    if num_pages < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS < 2:
+        pages = await run_in_threadpool(extract_pages, path, 0, num_pages)
+    else:
+        loop = asyncio.get_running_loop()
+        chunk = -(-num_pages // PDF_WORKERS)
+        ranges = [(start, min(start + chunk, num_pages)) for start in range(0, num_pages, chunk)]
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(_get_pool(), extract_pages, path, start, stop)
+            for start, stop in ranges
+        ])
+        pages = [text for texts in chunks for text in texts]
+
+    return "\n".join(pages).strip()
@@ -0,0 +1,213 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+import math
+import os
+import re
+import threading
+
+from .llm_client import OPENAI_MODEL
+from .skill_matcher import get_skill_matcher
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+load_dotenv()
+
+# Token budget for the job description in question generation prompts
+PROMPT_JOB_DESCRIPTION_TOKENS = int(os.getenv("PROMPT_JOB_DESCRIPTION_TOKENS", "600"))
+
+# Headings of sections that never help generate questions; the section runs until the next heading
+BOILERPLATE_HEADING = re.compile(
+    r"^(equal (employment )?opportunity|eeo\b|diversity|benefits|perks|what we offer|why join|compensation and benefits"
+    r"|our benefits|cookie|privacy|legal|disclaimer|accommodations?|how to apply|similar jobs|share this job"
+    r"|recruitment fraud|about (us|the company))\b",
+    re.I
+)
+# Headings of the sections worth keeping first when the budget is tight
+PRIORITY_HEADING = re.compile(
+    r"^(requirements|qualifications|minimum qualifications|preferred qualifications|responsibilities"
+    r"|what you('ll| will) do|what you('ll| will) bring|what we('re| are) looking for|skills|must have|nice to have"
+    r"|your role|the role|key duties|you have|about you)\b",
+    re.I
+)
+# Sentences that are boilerplate wherever they appear, including in text without line breaks
+BOILERPLATE_SENTENCE = re.compile(
+    r"equal opportunity employer|without regard to (race|sex|age)|regardless of (race|gender)|protected veteran"
+    r"|reasonable accommodation|e-verify|we use cookies|accept (all )?cookies|cookie (policy|settings|preferences)"
+    r"|privacy (policy|notice)|all rights reserved|terms of use|apply now|share this (job|posting)|save this job"
+    r"|sign in to|create (a )?job alert|similar jobs|report this job|recruitment agencies|unsolicited resumes",
+    re.I
+)
+# Sentence ends and inline bullets, for descriptions flattened onto one line
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9•▪●*-])|\s+(?=[•▪●*-]\s)")
+_BULLET = re.compile(r"^[\s•▪●*\-–]+")
+
+def _approximate_tokens(text: str) -> int:
+    # About four characters per token for English text with GPT tokenizers
+    return math.ceil(len(text) / 4)
+
+def get_token_counter(model: str = OPENAI_MODEL) -> Callable[[str], int]:
+    """
+    Get a function that counts the tokens of a text for a model
+
+    Uses tiktoken when installed, otherwise a characters-per-token estimate.
+    """
+    if tiktoken is None:
+        return _approximate_tokens
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+def _is_heading(line: str) -> bool:
+    """Section headings such as "Requirements:", "WHAT WE OFFER" or "Benefits"; never bullets"""
+    if _BULLET.match(line):
+        return False
+    stripped = line.rstrip(":")
+    if not 0 < len(stripped) <= 60 or len(stripped.split()) > 8 or stripped.endswith((".", ",", ";", "!", "?")):
+        return False
+    return line.endswith(":") or stripped.isupper() or bool(
+        BOILERPLATE_HEADING.match(stripped) or PRIORITY_HEADING.match(stripped)
+    )
+
+def _segments(text: str) -> List[str]:
+    """Split text into lines, and long lines into sentences and bullets"""
+    segments = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if len(line) <= 300:
+            segments.append(line)
+        else:
+            segments.extend(part.strip() for part in _SENTENCE_END.split(line) if part.strip())
+    return segments
+
+def _normalize(segment: str) -> str:
+    return " ".join(_BULLET.sub("", segment).lower().split())
+
+class PromptCompactor:
+    """
+    Shrinks job descriptions to a token budget before they go into prompts
+
+    Drops duplicate lines, boilerplate sections and sentences, then keeps
+    requirement-like content first until the budget is met. The kept
+    segments stay in their original order.
+    """
+
+    def __init__(self, count_tokens: Optional[Callable[[str], int]] = None):
+        self.count_tokens = count_tokens or get_token_counter()
+        self._lock = threading.Lock()
+        self.compactions = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+
+    def compact(self, text: str, max_tokens: int = PROMPT_JOB_DESCRIPTION_TOKENS) -> str:
+        """
+        Compact a job description
+
+        Args:
+            text: Job description as parsed or pasted
+            max_tokens: Token budget for the result
+
+        Returns:
+            The compacted description, one segment per line
+        """
+        kept: List[Tuple[int, str, int]] = []  # (priority, segment, tokens); 0 is kept first
+        seen = set()
+        section_priority = 1
+        skipping = False
+        skills = get_skill_matcher()
+
+        for segment in _segments(text):
+            key = _normalize(segment)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            if BOILERPLATE_SENTENCE.search(segment):
+                continue
+
+            if _is_heading(segment):
+                heading = segment.rstrip(":")
+                skipping = bool(BOILERPLATE_HEADING.match(heading))
+                section_priority = 0 if PRIORITY_HEADING.match(heading) else 1
+                if skipping:
+                    continue
+            elif skipping:
+                continue
+
+            priority = section_priority
+            if priority and next(iter(skills.find(segment)), None) is not None:
+                priority = 0
+            kept.append((priority, segment, self.count_tokens(segment) + 1))
+
+        budget = max_tokens
+        selected = [False] * len(kept)
+        oversize = None
+        for priority in (0, 1):
+            for i, (segment_priority, _, tokens) in enumerate(kept):
+                if segment_priority != priority:
+                    continue
+                if tokens <= budget:
+                    selected[i] = True
+                    budget -= tokens
+                elif oversize is None:
+                    oversize = i
+        # The first segment that did not fit gets whatever budget is left
+        if oversize is not None and budget > 1:
+            priority, segment, _ = kept[oversize]
+            segment = self._truncate(segment, budget - 1)
+            if segment:
+                kept[oversize] = (priority, segment, self.count_tokens(segment) + 1)
+                selected[oversize] = True
+                budget -= kept[oversize][2]
+        result = "\n".join(segment for (_, segment, _), chosen in zip(kept, selected) if chosen)
+        if not result:
+            # Better a cut-off description than none at all
+            result = self._truncate(text.strip(), max_tokens)
+            budget = max_tokens - self.count_tokens(result)
+
+        with self._lock:
+            self.compactions += 1
+            self.tokens_in += self.count_tokens(text)
+            self.tokens_out += max_tokens - budget
+        return result
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text at a word boundary to at most max_tokens tokens"""
+        if max_tokens <= 0:
+            return ""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        prefix = text[:low]
+        space = prefix.rfind(" ")
+        return (prefix[:space] if space > 0 else prefix).rstrip()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get token counts before and after compaction"""
+        return {
+            "tokenizer": "tiktoken" if tiktoken is not None else "approximate",
+            "compactions": self.compactions,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "ratio": self.tokens_out / self.tokens_in if self.tokens_in else None
+        }
+
+_compactor: Optional[PromptCompactor] = None
+
+def get_prompt_compactor() -> PromptCompactor:
+    """Get the process-wide compactor"""
+    global _compactor
+    if _compactor is None:
+        _compactor = PromptCompactor()
+    return _compactor
@@ -1,21 +1,20 @@
-from openai import OpenAI
-import os
 from typing import List, Dict
-from dotenv import load_dotenv
-import json
 
-load_dotenv()
+from .llm_client import get_async_client, OPENAI_MODEL
+from .llm_cache import get_llm_cache
+from .structured_output import GeneratedQuestions, StructuredOutputError, get_output_parser, response_format
+from ..timing import span
 
 class QuestionGenerator:
     """Service for generating interview questions using OpenAI"""
     
     def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_async_client()
+        self.model = OPENAI_MODEL
+        self.cache = get_llm_cache()
+        self.output_parser = get_output_parser()
     
-    def generate_questions(
+    async def generate_questions(
         self,
         job_title: str,
         job_description: str,
@@ -28,7 +27,7 @@ class QuestionGenerator:
         
         Args:
             job_title: Title of the position
-            job_description: Full job description
+            job_description: Job description, already compacted (see crud.compact_job_description)
             company_name: Name of the company (optional)
             num_questions: Number of questions to generate
             difficulty: Difficulty level (easy, medium, hard)
@@ -42,7 +41,7 @@ class QuestionGenerator:
         prompt = f"""You are an expert interview coach. Generate {num_questions} interview questions for a {job_title} position{company_context}.
 
 Job Description:
-{job_description[:2000]}
+{job_description}
 
 Requirements:
 1. Generate a mix of behavioral, technical, and situational questions
@@ -51,53 +50,64 @@ Requirements:
 4. Include questions that assess both technical skills and soft skills
 5. Format each question as a JSON object with: question_text, question_type (behavioral/technical/situational), difficulty
 
-Return ONLY a JSON array of questions, no additional text.
+Return ONLY a JSON object with a "questions" array, no additional text.
 
 Example format:
-[
-  {{
-    "question_text": "Tell me about a time when you had to debug a complex issue in production.",
-    "question_type": "behavioral",
-    "difficulty": "medium"
-  }}
-]
+{{
+  "questions": [
+    {{
+      "question_text": "Tell me about a time when you had to debug a complex issue in production.",
+      "question_type": "behavioral",
+      "difficulty": "medium"
+    }}
+  ]
+}}
 """
         
+        request_params = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert interview coach who generates relevant, insightful interview questions. Always respond with valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.8,
+            "max_tokens": 2000,
+            **response_format(self.model)
+        }
+        
+        # Identical postings produce identical prompts, so serve them from cache
+        cache_key = self.cache.make_key(**request_params)
+        cached_questions = await self.cache.get(cache_key)
+        if cached_questions is not None:
+            return cached_questions
+        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert interview coach who generates relevant, insightful interview questions. Always respond with valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.8,
-                max_tokens=2000
-            )
+            with span("llm"):
+                response = await self.client.chat.completions.create(**request_params)
             
-            content = response.choices[0].message.content.strip()
+            content = response.choices[0].message.content or ""
             
-            # Parse JSON response
-            questions = json.loads(content)
-            
-            # Validate and ensure we have the right number of questions
-            if not isinstance(questions, list):
-                raise ValueError("Response is not a list")
+            # Parse and validate; malformed output gets a repair call, not a regeneration
+            parsed = await self.output_parser.parse("questions", content, GeneratedQuestions)
+            questions = [q.model_dump() for q in parsed.questions]
             
             # Add order to questions
             for i, q in enumerate(questions[:num_questions]):
                 q['order'] = i + 1
             
+            await self.cache.set(cache_key, questions[:num_questions])
+            
             return questions[:num_questions]
             
-        except json.JSONDecodeError as e:
+        except StructuredOutputError as e:
             # Fallback: create default questions
-            print(f"JSON decode error: {e}")
+            print(f"Unparseable questions: {e}")
             return self._generate_fallback_questions(job_title, num_questions, difficulty)
         except Exception as e:
             print(f"Error generating questions: {e}")
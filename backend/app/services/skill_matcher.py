@@ -0,0 +1,138 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+import os
+import re
+
+load_dotenv()
+
+SKILLS_FILE = os.getenv("SKILLS_FILE", str(Path(__file__).resolve().parent.parent / "data" / "skills.txt"))
+
+class SkillMatch:
+    """Occurrences of one canonical skill in a text"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.offsets: List[Tuple[int, int]] = []  # (start, end) of each occurrence
+
+def load_skills(path: str) -> List[Tuple[str, List[str]]]:
+    """
+    Read a skill dictionary file
+
+    Each line is "Canonical Name | alias, alias"; blank lines and lines
+    starting with # are ignored.
+
+    Returns:
+        (canonical name, aliases) pairs; names keep their = prefix
+    """
+    skills = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, _, aliases = line.partition("|")
+            skills.append((name.strip(), [alias.strip() for alias in aliases.split(",") if alias.strip()]))
+    return skills
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie of the words
+
+    Shared prefixes are matched once and longer words are tried before their
+    prefixes, so the regex engine's work at each position depends on the
+    word lengths rather than on the number of words.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        ends = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            # Optional suffix: greedy, so the longest word wins and backtracking finds the shorter one
+            return ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+class SkillMatcher:
+    """Finds skills and their aliases in a single pass with one compiled regex"""
+
+    def __init__(self, skills: List[Tuple[str, List[str]]]):
+        """
+        Args:
+            skills: (canonical name, aliases) pairs; a leading = on a name
+                or alias makes it match case-sensitively
+        """
+        self.skills: List[str] = []
+        self._folded: Dict[str, str] = {}  # lowercased form -> canonical name
+        self._exact: Dict[str, str] = {}  # case-sensitive form -> canonical name
+
+        for name, aliases in skills:
+            canonical = name.lstrip("=")
+            self.skills.append(canonical)
+            for form in [name] + aliases:
+                if form.startswith("="):
+                    self._exact.setdefault(form[1:], canonical)
+                else:
+                    self._folded.setdefault(form.lower(), canonical)
+
+        alternatives = []
+        if self._folded:
+            alternatives.append("(?P<folded>(?i:" + _trie_pattern(self._folded) + "))")
+        if self._exact:
+            alternatives.append("(?P<exact>" + _trie_pattern(self._exact) + ")")
+        # Whole words only; forms may start or end with punctuation (.NET, C++)
+        self._pattern = re.compile(r"(?<!\w)(?:" + "|".join(alternatives or ["(?!)"]) + r")(?!\w)")
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        """Build a matcher from a skill dictionary file"""
+        return cls(load_skills(path))
+
+    def find(self, text: str) -> Iterable[Tuple[str, int, int]]:
+        """Yield (canonical name, start, end) for every skill occurrence, in text order"""
+        folded, exact = self._folded, self._exact
+        for match in self._pattern.finditer(text):
+            form = match.group()
+            if match.lastgroup == "folded":
+                yield folded[form.lower()], match.start(), match.end()
+            else:
+                yield exact[form], match.start(), match.end()
+
+    def match(self, text: str) -> Dict[str, SkillMatch]:
+        """
+        Find every skill in a text
+
+        Args:
+            text: Text to search, e.g. a job description
+
+        Returns:
+            SkillMatch by canonical name, in order of first occurrence
+        """
+        matches: Dict[str, SkillMatch] = {}
+        for name, start, end in self.find(text):
+            skill = matches.get(name)
+            if skill is None:
+                skill = matches[name] = SkillMatch(name)
+            skill.count += 1
+            skill.offsets.append((start, end))
+        return matches
+
+_matcher: Optional[SkillMatcher] = None
+
+def get_skill_matcher() -> SkillMatcher:
+    """Get the process-wide matcher built from SKILLS_FILE"""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher.from_file(SKILLS_FILE)
+    return _matcher
@@ -0,0 +1,14 @@
+import json
+
+def sse_event(event: str, data: dict) -> str:
+    """
+    Format a Server-Sent Event
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        The event, ready to be written to a text/event-stream response
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
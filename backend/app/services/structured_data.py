@@ -0,0 +1,88 @@
+from typing import Any, Dict, Iterator, Optional
+import html
+import json
+import re
+
+# <script type="application/ld+json"> blocks, found on the raw bytes without parsing the page
+LD_JSON_SCRIPT = re.compile(
+    rb'<script[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.I | re.S
+)
+_BLOCK_TAG = re.compile(r'<\s*(br|/p|/li|/div|/h[1-6]|/tr|/ul|/ol)\b[^>]*>', re.I)
+_ANY_TAG = re.compile(r'<[^>]+>')
+# Line breaks and closing tags: markup, rather than text that mentions a tag
+_MARKUP = re.compile(r'<\s*br\b[^>]*>|</\s*[a-z][a-z0-9]*\s*>', re.I)
+# Descriptions are often entity-encoded HTML, sometimes twice
+_MAX_DECODES = 3
+_WRAPPER = re.compile(r'^\s*(<!--|<!\[CDATA\[)|(-->|\]\]>)\s*$')
+
+def _json_objects(data: Any, depth: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yield every object in a JSON-LD document, including @graph members"""
+    if depth > 5:
+        return
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_objects(item, depth + 1)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                yield from _json_objects(value, depth + 1)
+
+def _is_job_posting(obj: Dict[str, Any]) -> bool:
+    types = obj.get("@type")
+    if isinstance(types, str):
+        types = [types]
+    return isinstance(types, list) and "JobPosting" in types
+
+def html_to_text(fragment: str) -> str:
+    """Turn an HTML fragment such as a JobPosting description into plain text"""
+    text = fragment
+    for _ in range(_MAX_DECODES):
+        # Strip before unescaping, so escaped text like "&lt;b and b&gt;" is kept
+        text = html.unescape(_ANY_TAG.sub("", _BLOCK_TAG.sub("\n", text)))
+        # Entity-encoded HTML turns into markup here, or after one more unescape
+        if not _MARKUP.search(html.unescape(text)):
+            break
+    return text
+
+def extract_job_posting(content: bytes) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Read schema.org JobPosting data embedded as JSON-LD
+
+    Args:
+        content: Raw HTML as downloaded
+
+    Returns:
+        Dictionary with title, company_name and description (plain text), or
+        None if the page has no usable JobPosting
+    """
+    for match in LD_JSON_SCRIPT.finditer(content):
+        try:
+            block = match.group(1).decode("utf-8")
+            data = json.loads(_WRAPPER.sub("", block), strict=False)
+        except (UnicodeDecodeError, ValueError):
+            continue
+
+        for obj in _json_objects(data):
+            if not _is_job_posting(obj):
+                continue
+            title = obj.get("title")
+            description = obj.get("description")
+            if not isinstance(title, str) or not isinstance(description, str):
+                continue
+            if not title.strip() or not description.strip():
+                continue
+
+            organization = obj.get("hiringOrganization")
+            if isinstance(organization, dict):
+                organization = organization.get("name")
+            company_name = html.unescape(organization).strip() if isinstance(organization, str) else None
+
+            return {
+                "title": html.unescape(title).strip(),
+                "company_name": company_name or None,
+                "description": html_to_text(description)
+            }
+
+    return None
@@ -0,0 +1,268 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Dict, List, Optional, Type, TypeVar
+from dotenv import load_dotenv
+import json
+import math
+import os
+import re
+import threading
+
+from .json_stream import JSONObjectStreamParser
+from .llm_client import get_async_client, OPENAI_MODEL
+from ..timing import span
+
+load_dotenv()
+
+# Ask for JSON mode (response_format json_object): true, false, or auto for the models known to support it
+LLM_JSON_MODE = os.getenv("LLM_JSON_MODE", "auto").lower()
+# Model for repairing malformed responses; the repair prompt is small, so a cheaper model is enough
+LLM_REPAIR_MODEL = os.getenv("LLM_REPAIR_MODEL") or OPENAI_MODEL
+LLM_REPAIR_MAX_TOKENS = int(os.getenv("LLM_REPAIR_MAX_TOKENS", "2000"))
+
+_JSON_MODE_MODELS = re.compile(r"^(gpt-4o|gpt-4\.1|gpt-4-turbo|gpt-4-(1106|0125)|gpt-3\.5-turbo($|-(1106|0125))|o\d)")
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.S | re.I)
+_VALUE_START = re.compile(r"[\[{]")
+# Bracket positions tried per candidate before giving up on it
+_MAX_STARTS = 20
+
+QUESTION_TYPES = ("behavioral", "technical", "situational")
+
+class GeneratedQuestion(BaseModel):
+    question_text: str = Field(min_length=1)
+    question_type: str = "behavioral"
+    difficulty: str = "medium"
+
+    @field_validator("question_type", mode="before")
+    @classmethod
+    def known_question_type(cls, value: Any) -> str:
+        value = str(value or "").strip().lower()
+        return value if value in QUESTION_TYPES else "behavioral"
+
+class GeneratedQuestions(BaseModel):
+    questions: List[GeneratedQuestion] = Field(min_length=1)
+
+    @model_validator(mode="before")
+    @classmethod
+    def wrap_list(cls, value: Any) -> Any:
+        # Without JSON mode models answer with a bare array, or use another key
+        if isinstance(value, list):
+            return {"questions": value}
+        if isinstance(value, dict) and "questions" not in value:
+            lists = [v for v in value.values() if isinstance(v, list)]
+            if len(lists) == 1:
+                return {"questions": lists[0]}
+        return value
+
+class EvaluationFields(BaseModel):
+    """Answer evaluation fields, each optional; unusable values become None"""
+
+    relevance_score: Optional[float] = None
+    structure_score: Optional[float] = None
+    professionalism_score: Optional[float] = None
+    overall_score: Optional[float] = None
+    strengths: Optional[str] = None
+    weaknesses: Optional[str] = None
+    suggestions: Optional[str] = None
+    star_analysis: Optional[str] = None
+    example_answer: Optional[str] = None
+
+    @field_validator("relevance_score", "structure_score", "professionalism_score", "overall_score", mode="before")
+    @classmethod
+    def clamp_score(cls, value: Any) -> Optional[float]:
+        if value is None or isinstance(value, bool):
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return min(100.0, max(0.0, value)) if math.isfinite(value) else None
+
+    @field_validator("strengths", "weaknesses", "suggestions", "star_analysis", "example_answer", mode="before")
+    @classmethod
+    def feedback_text(cls, value: Any) -> Optional[str]:
+        # Models sometimes answer with a list of points or an object per aspect
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, list):
+            return "\n".join(str(item) for item in value if item is not None)
+        if isinstance(value, dict):
+            return "\n".join(f"{key}: {item}" for key, item in value.items() if item is not None)
+        return str(value)
+
+class AnswerEvaluation(EvaluationFields):
+    @model_validator(mode="after")
+    def has_scores(self) -> "AnswerEvaluation":
+        if all(getattr(self, field) is None for field in self.model_fields if field.endswith("_score")):
+            raise ValueError("No scores in evaluation")
+        return self
+
+Model = TypeVar("Model", bound=BaseModel)
+
+class StructuredOutputError(ValueError):
+    """A response that could not be parsed, even after a repair"""
+
+def json_mode_enabled(model: str) -> bool:
+    if LLM_JSON_MODE in ("true", "false"):
+        return LLM_JSON_MODE == "true"
+    return bool(_JSON_MODE_MODELS.match(model))
+
+def response_format(model: str) -> Dict[str, Any]:
+    """
+    Request parameters for JSON mode, if the model supports it
+
+    Example:
+        await client.chat.completions.create(model=model, messages=messages, **response_format(model))
+    """
+    return {"response_format": {"type": "json_object"}} if json_mode_enabled(model) else {}
+
+def extract_json(text: str, partial: bool = False) -> Any:
+    """
+    Recover the JSON value in a model response
+
+    Handles Markdown code fences and prose before or after the value.
+
+    Args:
+        text: Response text
+        partial: For an object that is cut off (max_tokens) or broken part
+            way, return the members completed before the break
+
+    Raises:
+        ValueError: If no JSON value can be recovered
+    """
+    decoder = json.JSONDecoder()
+    for candidate in [m.group(1) for m in _FENCE.finditer(text)] + [text]:
+        for i, match in enumerate(_VALUE_START.finditer(candidate)):
+            if i == _MAX_STARTS:
+                break
+            try:
+                return decoder.raw_decode(candidate, match.start())[0]
+            except json.JSONDecodeError:
+                continue
+
+    if not partial:
+        raise ValueError("No JSON value found in response")
+    parser = JSONObjectStreamParser()
+    try:
+        pairs = parser.feed(text)
+    except ValueError:
+        pairs = []
+    if pairs:
+        return dict(pairs)
+    raise ValueError("No JSON value found in response")
+
+class StructuredOutputParser:
+    """
+    Validates LLM responses against pydantic models
+
+    Tries strict JSON first, then the tolerant extract_json(), and only then
+    asks the model to repair its output: a short call with the broken text
+    and the validation error, instead of regenerating from the full prompt.
+    If the repair fails too, whatever was complete before the text broke
+    off is used, provided it still validates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, counter: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(kind, dict.fromkeys(
+                ("parsed", "recovered", "parse_failures", "repairs", "repair_failures", "default_scores"), 0
+            ))
+            counts[counter] += 1
+
+    def record_default_scores(self, kind: str) -> None:
+        """Count a response that had no usable scores, so defaults were used"""
+        self._count(kind, "default_scores")
+
+    def _validate(self, kind: str, content: str, model: Type[Model]) -> Model:
+        with span("json"):
+            try:
+                value = json.loads(content)
+                recovered = False
+            except json.JSONDecodeError:
+                value = extract_json(content)
+                recovered = True
+            result = model.model_validate(value)
+        self._count(kind, "recovered" if recovered else "parsed")
+        return result
+
+    async def parse(self, kind: str, content: str, model: Type[Model], repair: bool = True) -> Model:
+        """
+        Parse and validate a response, repairing it if needed
+
+        Args:
+            kind: Counter label, e.g. "questions"
+            content: Response text
+            model: Pydantic model the response must match
+            repair: Whether to make a repair call when parsing fails
+
+        Returns:
+            The validated model
+
+        Raises:
+            StructuredOutputError: If the response cannot be parsed or repaired
+        """
+        try:
+            return self._validate(kind, content, model)
+        except ValueError as e:  # Includes pydantic's ValidationError
+            self._count(kind, "parse_failures")
+            error: Exception = e
+
+        if repair and content.strip():
+            try:
+                return await self._repair(kind, content, model, error)
+            except StructuredOutputError as e:
+                error = e
+
+        try:
+            with span("json"):
+                result = model.model_validate(extract_json(content, partial=True))
+        except ValueError:
+            raise StructuredOutputError(str(error)) from error
+        self._count(kind, "recovered")
+        return result
+
+    async def _repair(self, kind: str, content: str, model: Type[Model], error: Exception) -> Model:
+        self._count(kind, "repairs")
+        schema = json.dumps(model.model_json_schema(), separators=(",", ":"))
+        try:
+            with span("llm"):
+                response = await get_async_client().chat.completions.create(
+                    model=LLM_REPAIR_MODEL,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": f"You fix malformed JSON. Return only the corrected JSON, matching this JSON Schema: {schema}"
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Error: {str(error)[:500]}\n\nJSON to fix:\n{content}"
+                        }
+                    ],
+                    temperature=0,
+                    max_tokens=LLM_REPAIR_MAX_TOKENS,
+                    **response_format(LLM_REPAIR_MODEL)
+                )
+            return self._validate(kind, response.choices[0].message.content or "", model)
+        except Exception as e:
+            self._count(kind, "repair_failures")
+            raise StructuredOutputError(f"Repair failed: {e}") from e
+
+    def stats(self) -> Dict[str, Any]:
+        """Get parse, recovery and repair counts by kind"""
+        with self._lock:
+            return {
+                "json_mode": json_mode_enabled(OPENAI_MODEL),
+                **{kind: dict(counts) for kind, counts in self._counts.items()}
+            }
+
+_parser: Optional[StructuredOutputParser] = None
+
+def get_output_parser() -> StructuredOutputParser:
+    """Get the process-wide parser, so its counters cover every service"""
+    global _parser
+    if _parser is None:
+        _parser = StructuredOutputParser()
+    return _parser
@@ -0,0 +1,221 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from dotenv import load_dotenv
+import os
+import re
+import threading
+import time
+
+load_dotenv()
+
+TIMING_ENABLED = os.getenv("TIMING_ENABLED", "true").lower() == "true"
+# Send per-stage durations to clients; disable if they should not see them
+TIMING_SERVER_TIMING_HEADER = os.getenv("TIMING_SERVER_TIMING_HEADER", "true").lower() == "true"
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class MetricsRegistry:
+    """Histograms by metric name and label values"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Tuple[Tuple[str, str], ...], Histogram]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines for every histogram"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    labels = ",".join(f'{k}="{_escape(v)}"' for k, v in key)
+                    prefix = labels + "," if labels else ""
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+                    suffix = "{" + labels + "}" if labels else ""
+                    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+                    lines.append(f"{name}_count{suffix} {histogram.count}")
+        return lines
+
+registry = MetricsRegistry()
+registry.describe("http_request_duration_seconds", "Time from request to end of response, by route")
+registry.describe("http_request_stage_duration_seconds", "Time spent per request in each stage (db, llm, ...), by route")
+
+class RequestTiming:
+    """Time spent in each stage during one request"""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Stages may be recorded from threadpool workers
+        self.stages: Dict[str, List[float]] = {}  # stage -> [seconds, calls]
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                self.stages[stage] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+def record(stage: str, seconds: float) -> None:
+    """Add time to a stage of the current request; a no-op outside requests"""
+    timing = _current.get()
+    if timing is not None:
+        timing.add(stage, seconds)
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    Time a block as part of a stage of the current request
+
+    Stages may nest (auth includes the db time of its lookup); each is
+    reported on its own.
+
+    Example:
+        with span("llm"):
+            response = await client.chat.completions.create(...)
+    """
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(stage, time.perf_counter() - start)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _route_label(scope: Dict[str, Any]) -> str:
+    """Route template (/interviews/{session_id}), so that labels stay bounded"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+def _server_timing(timing: RequestTiming, total: float) -> bytes:
+    entries = [
+        f"{stage};dur={seconds * 1000:.1f};desc=\"{calls} calls\""
+        for stage, (seconds, calls) in timing.stages.items()
+    ]
+    entries.append(f"app;dur={total * 1000:.1f}")
+    return ", ".join(entries).encode("latin-1")
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware that times each request and its stages
+
+    Adds a Server-Timing header with the stages recorded before the response
+    started (for streamed responses, the rest are still counted in the
+    histograms) and records per-route and per-stage histograms for /metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if TIMING_SERVER_TIMING_HEADER:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(timing, time.perf_counter() - start)))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = _route_label(scope)
+            registry.observe(
+                "http_request_duration_seconds", elapsed,
+                route=route, method=scope["method"], status=str(status_code)
+            )
+            for stage, (seconds, _) in timing.stages.items():
+                registry.observe("http_request_stage_duration_seconds", seconds, route=route, stage=stage)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._timing_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_timing_start", None)
+    if start is not None:
+        record("db", time.perf_counter() - start)
+
+def instrument_engine(engine) -> None:
+    """Record the time of every statement executed on a (sync) engine as the db stage"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+_METRIC_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+def render_gauges(prefix: str, values: Dict[str, Any]) -> List[str]:
+    """
+    Render a stats() dictionary as Prometheus gauges
+
+    Nested dictionaries extend the name; non-numeric values are skipped.
+
+    Example:
+        render_gauges("password_hashing", hasher.stats())
+    """
+    lines = []
+    for key, value in values.items():
+        name = _METRIC_NAME.sub("_", f"{prefix}_{key}")
+        if isinstance(value, dict):
+            lines.extend(render_gauges(name, value))
+        elif isinstance(value, bool):
+            lines.append(f"{name} {int(value)}")
+        elif isinstance(value, (int, float)):
+            lines.append(f"{name} {value}")
+    return lines
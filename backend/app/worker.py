@@ -0,0 +1,86 @@
+"""
+LLM job worker
+
+Drains the llm_jobs queue filled by the API in queue mode (LLM_JOB_QUEUE=true).
+Run as many workers, on as many machines, as OpenAI throughput calls for;
+they coordinate through FOR UPDATE SKIP LOCKED on the queue table.
+
+Usage (from backend/):
+    python -m app.worker --concurrency 8
+"""
+from typing import Optional
+from dotenv import load_dotenv
+import argparse
+import asyncio
+import os
+import signal
+
+from .database import async_engine, new_async_session
+from .services.http_client import close_http_clients
+from .services.llm_client import close_async_client
+from .services.llm_jobs import claim_job, run_job
+
+load_dotenv()
+
+LLM_WORKER_CONCURRENCY = int(os.getenv("LLM_WORKER_CONCURRENCY", "4"))
+# How long an idle worker waits before looking at the queue again
+LLM_WORKER_POLL_SECONDS = float(os.getenv("LLM_WORKER_POLL_SECONDS", "1.0"))
+
+async def work(stop: asyncio.Event, poll_seconds: float, once: bool = False) -> None:
+    """Claim and run jobs one at a time until stop is set (or the queue is empty, with once)"""
+    while not stop.is_set():
+        db = new_async_session()
+        try:
+            job = await claim_job(db)
+        except Exception as e:
+            print(f"Failed to claim job: {e}")
+            job = None
+        finally:
+            await db.close()
+
+        if job is None:
+            if once:
+                return
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        try:
+            await run_job(job)
+        except Exception as e:
+            # The lease expires and another worker retries the job
+            print(f"Job {job.id} crashed: {e}")
+
+async def main(concurrency: int, poll_seconds: float, once: bool = False, stop: Optional[asyncio.Event] = None) -> None:
+    """
+    Run concurrency job loops until SIGINT/SIGTERM
+
+    In-flight jobs are finished before exiting; a second signal is not handled
+    specially, so an interrupted job is retried once its lease expires.
+    """
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    print(f"LLM worker started with concurrency {concurrency}")
+    try:
+        await asyncio.gather(*[work(stop, poll_seconds, once) for _ in range(concurrency)])
+    finally:
+        await close_async_client()
+        await close_http_clients()
+        if async_engine is not None:
+            await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=LLM_WORKER_CONCURRENCY, help="Jobs to run at once")
+    parser.add_argument("--poll-seconds", type=float, default=LLM_WORKER_POLL_SECONDS)
+    parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.poll_seconds, args.once))
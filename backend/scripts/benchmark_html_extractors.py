@@ -0,0 +1,103 @@
+"""
+Benchmark the HTML extraction engines over a corpus of saved job pages
+
+Times every installed engine (selectolax, lxml, bs4) on each page, checks
+that the fast engines agree with bs4 on what JobParser extracts, and times
+the JSON-LD JobPosting fast path.
+
+Usage (from backend/):
+    # Save pages into the corpus directory
+    python -m scripts.benchmark_html_extractors --corpus job_pages --fetch https://... https://...
+
+    # Benchmark
+    python -m scripts.benchmark_html_extractors --corpus job_pages --repeat 5
+"""
+from pathlib import Path
+from typing import List
+import argparse
+import hashlib
+import statistics
+import sys
+import time
+
+from app.services.html_extractor import available_extractors, create_html_extractor
+from app.services.http_client import fetch_sync
+from app.services.job_parser import JobParser
+from app.services.structured_data import extract_job_posting
+
+def save_pages(corpus: Path, urls: List[str]) -> None:
+    """Download pages into the corpus, named by a hash of their URL"""
+    corpus.mkdir(parents=True, exist_ok=True)
+    for url in urls:
+        try:
+            page = fetch_sync(url)
+        except Exception as e:
+            print(f"skip {url}: {e}")
+            continue
+        path = corpus / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:16] + ".html")
+        path.write_bytes(page.content)
+        print(f"saved {url} -> {path} ({len(page.content)} bytes)")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, required=True, help="Directory of saved .html pages")
+    parser.add_argument("--fetch", nargs="+", metavar="URL", help="Save these pages into the corpus and exit")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.fetch:
+        save_pages(args.corpus, args.fetch)
+        return 0
+
+    pages = [path.read_bytes() for path in sorted(args.corpus.glob("*.html"))]
+    if not pages:
+        print(f"No .html pages in {args.corpus}")
+        return 1
+    size_mb = sum(len(page) for page in pages) / 1e6
+    print(f"{len(pages)} pages, {size_mb:.1f} MB, {args.repeat} rounds")
+
+    engines = available_extractors()
+    soup = create_html_extractor("bs4")
+    baseline = [JobParser.parse_html(page, "", soup, structured_data=False) for page in pages]
+
+    for engine in engines:
+        extractor = create_html_extractor(engine)
+        timings = []
+        for page in pages:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                extractor.extract(page)
+            timings.append((time.perf_counter() - start) / args.repeat)
+
+        results = [JobParser.parse_html(page, "", extractor, structured_data=False) for page in pages]
+        agree = {
+            field: sum(result[field] == expected[field] for result, expected in zip(results, baseline))
+            for field in ("job_title", "company_name", "job_description")
+        }
+
+        total = sum(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        print(
+            f"{engine:>10}: {len(pages) / total:8.1f} pages/s  "
+            f"mean {statistics.mean(timings) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms  "
+            f"same as bs4: " + ", ".join(f"{field} {count}/{len(pages)}" for field, count in agree.items())
+        )
+
+    # JSON-LD fast path, which skips the engines entirely when it applies
+    timings = []
+    found = 0
+    for page in pages:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            posting = extract_job_posting(page)
+        timings.append((time.perf_counter() - start) / args.repeat)
+        found += posting is not None
+    print(
+        f"{'json-ld':>10}: {len(pages) / sum(timings):8.1f} pages/s  "
+        f"mean {statistics.mean(timings) * 1000:7.2f} ms  JobPosting found on {found}/{len(pages)} pages"
+    )
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Benchmark skill extraction as the skill dictionary grows
+
+Pads the SKILLS_FILE dictionary with synthetic skills and aliases up to each
+requested size, then times SkillMatcher over job descriptions. Throughput
+should stay roughly flat as the dictionary grows; for comparison, the
+one-regex-per-skill approach is timed on the smaller dictionaries.
+
+Usage (from backend/):
+    python -m scripts.benchmark_skill_matcher
+    python -m scripts.benchmark_skill_matcher --sizes 150 1000 10000 50000 --text descriptions.txt
+"""
+from pathlib import Path
+from typing import List, Tuple
+import argparse
+import random
+import re
+import sys
+import time
+
+from app.services.skill_matcher import SKILLS_FILE, SkillMatcher, load_skills
+
+FILLER = (
+    "we are looking for an engineer to join our team and build reliable services "
+    "you will work with product and design on features used by millions of customers "
+    "experience with modern tooling and a passion for quality are a plus"
+).split()
+
+def synthetic_skills(skills: List[Tuple[str, List[str]]], size: int, rng: random.Random) -> List[Tuple[str, List[str]]]:
+    """Pad a dictionary with made-up skills, some multi-word and some with aliases"""
+    skills = list(skills)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    seen = {name.lstrip("=").lower() for name, _ in skills}
+    while len(skills) < size:
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(rng.randint(1, 3))]
+        name = " ".join(word.capitalize() for word in words)
+        if name.lower() in seen:
+            continue
+        seen.add(name.lower())
+        aliases = [name.replace(" ", "")] if len(words) > 1 else []
+        skills.append((name, aliases))
+    return skills
+
+def synthetic_text(skills: List[Tuple[str, List[str]]], rng: random.Random, words: int = 600) -> str:
+    """A job description with roughly one skill mention per fifteen words"""
+    names = [name.lstrip("=") for name, _ in skills]
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(names) if rng.random() < 0.07 else rng.choice(FILLER))
+    return " ".join(out)
+
+def time_per_mb(run, texts: List[str], repeat: int) -> float:
+    size_mb = sum(len(text) for text in texts) / 1e6
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            run(text)
+    return size_mb * repeat / (time.perf_counter() - start)
+
+def naive_extract(patterns: List[Tuple[str, re.Pattern]]):
+    """The old approach: one case-insensitive search per skill"""
+    def run(text: str) -> None:
+        for name, pattern in patterns:
+            pattern.findall(text)
+    return run
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[150, 1000, 10000, 50000])
+    parser.add_argument("--text", type=Path, help="File of job descriptions separated by blank lines (default: synthetic)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--naive-max", type=int, default=1000, help="Largest dictionary to time the per-skill regexes on")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    base = load_skills(SKILLS_FILE)
+    if args.text:
+        texts = [block for block in args.text.read_text(encoding="utf-8").split("\n\n") if block.strip()]
+    else:
+        texts = [synthetic_text(base, rng) for _ in range(200)]
+    print(f"{len(texts)} descriptions, {sum(len(text) for text in texts) / 1e6:.2f} MB, {args.repeat} rounds")
+
+    for size in args.sizes:
+        skills = synthetic_skills(base, size, rng)
+        forms = sum(1 + len(aliases) for _, aliases in skills)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build = time.perf_counter() - start
+        found = sum(len(matcher.match(text)) for text in texts)
+        throughput = time_per_mb(matcher.match, texts, args.repeat)
+
+        line = (
+            f"{len(skills):>7} skills ({forms:>7} forms): build {build * 1000:8.1f} ms  "
+            f"matcher {throughput:7.2f} MB/s  {found / len(texts):5.1f} skills/description"
+        )
+        if size <= args.naive_max:
+            patterns = [
+                (name, re.compile(r"\b(?:" + "|".join(re.escape(form.lstrip("=")) for form in [name] + aliases) + r")\b", re.I))
+                for name, aliases in skills
+            ]
+            line += f"  per-skill regexes {time_per_mb(naive_extract(patterns), texts, 1):7.3f} MB/s"
+        print(line)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Check that the dashboard and history queries are served by indexes
+
+Seeds a large synthetic dataset inside a transaction, runs EXPLAIN on the
+per-user queries issued by the dashboard and interview routes, fails if any
+of them falls back to a sequential scan, and rolls everything back.
+
+Usage (from backend/, against a PostgreSQL database migrated to head):
+    python -m scripts.explain_hot_queries --sessions 1000000 --users 10000
+"""
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from datetime import datetime, timedelta
+import argparse
+import json
+import os
+import sys
+
+from app import crud
+
+def seed(conn, num_users: int, num_sessions: int) -> int:
+    """
+    Insert users, sessions, one question and one answer per session
+
+    IDs start after the current maximum so existing rows are left alone.
+
+    Returns:
+        ID of the first seeded user
+    """
+    offsets = {
+        table: conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}")).scalar()
+        for table in ("users", "interview_sessions", "questions", "answers")
+    }
+    conn.execute(text("""
+        INSERT INTO users (id, email, username, hashed_password, created_at)
+        SELECT :u + g, 'explain' || (:u + g) || '@example.com', 'explain' || (:u + g), 'x', now()
+        FROM generate_series(1, :users) g
+    """), {"users": num_users, "u": offsets["users"]})
+    conn.execute(text("""
+        INSERT INTO interview_sessions (id, user_id, job_title, job_description, created_at, completed, overall_score)
+        SELECT :s + g, :u + 1 + (g % :users), 'Engineer', 'Description',
+               now() - (g || ' minutes')::interval,
+               g % 5 <> 0,
+               CASE WHEN g % 5 <> 0 THEN 50 + (g % 50) END
+        FROM generate_series(1, :sessions) g
+    """), {"users": num_users, "sessions": num_sessions, "u": offsets["users"], "s": offsets["interview_sessions"]})
+    conn.execute(text("""
+        INSERT INTO questions (id, session_id, question_text, "order")
+        SELECT :q + g, :s + g, 'Question', 1 FROM generate_series(1, :sessions) g
+    """), {"sessions": num_sessions, "q": offsets["questions"], "s": offsets["interview_sessions"]})
+    conn.execute(text("""
+        INSERT INTO answers (id, session_id, question_id, answer_text, overall_score)
+        SELECT :a + g, :s + g, :q + g, 'Answer', 70 FROM generate_series(1, :sessions) g
+    """), {"sessions": num_sessions, "a": offsets["answers"], "q": offsets["questions"], "s": offsets["interview_sessions"]})
+    for table in ("users", "interview_sessions", "questions", "answers"):
+        conn.execute(text(f"ANALYZE {table}"))
+    return offsets["users"] + 1
+
+def hot_queries(user_id: int) -> dict:
+    """The per-user statements issued by the dashboard and interview routes"""
+    # A cursor some way into the user's history
+    cursor = crud.encode_session_cursor(datetime.utcnow() - timedelta(days=30), 0)
+    return {
+        "history": crud.session_list_statement(user_id, 11),
+        "session_list": crud.session_list_statement(user_id, 21),
+        "session_list_next_page": crud.session_list_statement(user_id, 21, cursor),
+        "dashboard_stats": crud.dashboard_stats_statement(user_id),
+    }
+
+def plan_nodes(plan: dict):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+def explain(conn, statement) -> list:
+    """Run EXPLAIN (FORMAT JSON) on a statement and return every node of its plan"""
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(plan_nodes(plan[0]["Plan"]))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    failures = 0
+
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            print(f"Seeding {args.sessions} sessions for {args.users} users...")
+            first_user_id = seed(conn, args.users, args.sessions)
+
+            for name, statement in hot_queries(user_id=first_user_id + 41).items():
+                nodes = explain(conn, statement)
+                seq_scans = [n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"]
+                scans = sorted({
+                    f"{n['Node Type']} using {n['Index Name']}" for n in nodes if "Index Name" in n
+                })
+                status = "FAIL" if seq_scans else "ok"
+                print(f"[{status}] {name}: {', '.join(scans) or 'no index used'}")
+                if seq_scans:
+                    failures += 1
+                    print(f"       sequential scan on {', '.join(seq_scans)}")
+        finally:
+            transaction.rollback()
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Load test of the interview flow
+
+Each virtual user registers, logs in, creates a session, generates questions,
+answers them, reads the session back and opens the dashboard. Reports
+requests per second and p50/p95/p99 latency per endpoint, plus the mean
+number of SQL statements per request.
+
+By default the app runs in-process (app.main:app over httpx's ASGI
+transport), against DATABASE_URL, with OpenAI replaced by
+scripts/mock_openai_server.py started on a free port. Use a scratch
+database: the test creates users and sessions.
+
+Usage (from backend/):
+    python -m scripts.load_test --users 200 --concurrency 20
+    python -m scripts.load_test --answer-mode batch --mock-args "--latency lognormal --latency-ms 800"
+    python -m scripts.load_test --json-out before.json    # then compare runs
+    python -m scripts.load_test --url http://127.0.0.1:8000    # running server; no query counts
+
+With LLM_JOB_QUEUE=true, queued jobs are polled until they finish and
+--workers in-process job loops drain the queue.
+"""
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+class Recorder:
+    """Latency, status and query count samples per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.queries: Dict[str, List[int]] = {}
+
+    def record(self, name: str, seconds: float, ok: bool, queries: Optional[int] = None) -> None:
+        self.latencies.setdefault(name, []).append(seconds)
+        self.errors.setdefault(name, 0)
+        if not ok:
+            self.errors[name] += 1
+        if queries is not None:
+            self.queries.setdefault(name, []).append(queries)
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        rows = {}
+        for name, samples in self.latencies.items():
+            samples = sorted(samples)
+            queries = self.queries.get(name)
+            rows[name] = {
+                "count": len(samples),
+                "errors": self.errors[name],
+                "rps": len(samples) / elapsed,
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "max_ms": samples[-1] * 1000,
+                "queries_mean": sum(queries) / len(queries) if queries else None
+            }
+        return rows
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    rank = max(1, -(-len(sorted_samples) * pct // 100))
+    return sorted_samples[int(rank) - 1]
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class FlowClient:
+    """Issues the flow's requests and records each one"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, count_queries=None, job_poll_seconds: float = 0.1):
+        self.client = client
+        self.recorder = recorder
+        self.count_queries = count_queries  # app.database.count_queries when running in-process
+        self.job_poll_seconds = job_poll_seconds
+
+    @contextmanager
+    def _counting(self) -> Iterator[Optional[object]]:
+        if self.count_queries is None:
+            yield None
+        else:
+            with self.count_queries() as counter:
+                yield counter
+
+    async def request(self, name: str, method: str, url: str, expect: int = 200, **kwargs) -> httpx.Response:
+        with self._counting() as counter:
+            start = time.perf_counter()
+            response = await self.client.request(method, url, **kwargs)
+            if kwargs.get("headers", {}).get("Accept") == "text/event-stream":
+                await response.aread()
+            elapsed = time.perf_counter() - start
+        ok = response.status_code in (expect, 202)
+        self.recorder.record(name, elapsed, ok, counter.count if counter is not None else None)
+        if not ok:
+            raise RuntimeError(f"{name}: {response.status_code} {response.text[:200]}")
+        if response.status_code == 202:
+            return await self._wait_for_job(name, response, start)
+        return response
+
+    async def _wait_for_job(self, name: str, accepted: httpx.Response, start: float) -> httpx.Response:
+        """Poll a queued job; records the time until its result as '<name> (job)'"""
+        job_id = accepted.json()["id"]
+        headers = accepted.request.headers
+        while True:
+            await asyncio.sleep(self.job_poll_seconds)
+            response = await self.client.get(f"/jobs/{job_id}", headers={"Authorization": headers["Authorization"]})
+            job = response.json()
+            if job["status"] in ("succeeded", "failed"):
+                ok = job["status"] == "succeeded"
+                self.recorder.record(f"{name} (job)", time.perf_counter() - start, ok)
+                if not ok:
+                    raise RuntimeError(f"{name}: job failed: {job['error']}")
+                return httpx.Response(200, json=job["result"])
+
+async def run_flow(flow: FlowClient, run_id: str, index: int, num_questions: int, answer_mode: str) -> None:
+    """One virtual user's visit"""
+    email = f"load-{run_id}-{index}@example.com"
+    await flow.request("POST /auth/register", "POST", "/auth/register", expect=201, json={
+        "email": email, "username": f"load-{run_id}-{index}", "password": "load-test-password"
+    })
+    response = await flow.request("POST /auth/login", "POST", "/auth/login", json={
+        "email": email, "password": "load-test-password"
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    # A distinct description per user, so the LLM cache does not hide the mock's latency
+    response = await flow.request("POST /interviews/", "POST", "/interviews/", expect=201, headers=headers, json={
+        "job_title": "Backend Engineer",
+        "company_name": "Load Test Inc",
+        "job_description": f"Run {run_id} user {index}. We build Python APIs with FastAPI and PostgreSQL. " * 20
+    })
+    session_id = response.json()["id"]
+
+    response = await flow.request(
+        "POST /interviews/{id}/questions", "POST", f"/interviews/{session_id}/questions",
+        headers=headers, json={"num_questions": num_questions}
+    )
+    questions = response.json()
+
+    answers = [
+        {"question_id": q["id"], "answer_text": f"In my last role I handled a similar situation by... ({q['id']})"}
+        for q in questions
+    ]
+    if answer_mode == "batch":
+        await flow.request(
+            "POST /interviews/{id}/answers:batch", "POST", f"/interviews/{session_id}/answers:batch",
+            headers=headers, json={"answers": answers}
+        )
+    else:
+        for answer in answers:
+            if answer_mode == "stream":
+                await flow.request(
+                    "POST /interviews/{id}/answer/stream", "POST", f"/interviews/{session_id}/answer/stream",
+                    headers={**headers, "Accept": "text/event-stream"}, json=answer
+                )
+            else:
+                await flow.request(
+                    "POST /interviews/{id}/answer", "POST", f"/interviews/{session_id}/answer",
+                    headers=headers, json=answer
+                )
+
+    await flow.request("GET /interviews/{id}", "GET", f"/interviews/{session_id}", headers=headers)
+    await flow.request("GET /dashboard/stats", "GET", "/dashboard/stats", headers=headers)
+
+async def run(args: argparse.Namespace) -> Dict:
+    recorder = Recorder()
+    count_queries = None
+    startup = shutdown = None
+    workers: List[asyncio.Task] = []
+    stop = asyncio.Event()
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        # Imported here: the app reads OPENAI_BASE_URL and friends at import time
+        from app.database import count_queries
+        from app.main import app
+        from app.services.llm_jobs import LLM_JOB_QUEUE
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test", timeout=args.timeout)
+        startup, shutdown = app.router.startup, app.router.shutdown
+        await startup()
+        if LLM_JOB_QUEUE:
+            from app.worker import work
+            workers = [asyncio.create_task(work(stop, 0.05)) for _ in range(args.workers)]
+
+    flow = FlowClient(client, recorder, count_queries)
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures: List[str] = []
+
+    async def user(index: int) -> None:
+        async with semaphore:
+            try:
+                await run_flow(flow, run_id, index, args.questions, args.answer_mode)
+            except Exception as e:
+                failures.append(str(e))
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(user(i) for i in range(args.users)))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        await asyncio.gather(*workers)
+        await client.aclose()
+        if shutdown is not None:
+            await shutdown()
+
+    total = sum(len(samples) for name, samples in recorder.latencies.items() if not name.endswith("(job)"))
+    return {
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "answer_mode": args.answer_mode,
+        "elapsed_seconds": elapsed,
+        "requests": total,
+        "rps": total / elapsed,
+        "failed_flows": len(failures),
+        "failure_samples": failures[:5],
+        "endpoints": recorder.summary(elapsed)
+    }
+
+def print_report(report: Dict) -> None:
+    print(
+        f"{report['users']} users, concurrency {report['concurrency']}, answers: {report['answer_mode']}\n"
+        f"{report['requests']} requests in {report['elapsed_seconds']:.1f} s = {report['rps']:.1f} req/s, "
+        f"{report['failed_flows']} failed flows"
+    )
+    for failure in report["failure_samples"]:
+        print(f"  {failure}")
+    print(f"\n{'endpoint':<44} {'count':>6} {'err':>4} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'queries':>8}")
+    for name, row in report["endpoints"].items():
+        queries = f"{row['queries_mean']:8.1f}" if row["queries_mean"] is not None else f"{'-':>8}"
+        print(
+            f"{name:<44} {row['count']:>6} {row['errors']:>4} {row['rps']:>7.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} {queries}"
+        )
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="Flows to run")
+    parser.add_argument("--concurrency", type=int, default=10, help="Flows in flight at once")
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--answer-mode", choices=["single", "batch", "stream"], default="single")
+    parser.add_argument("--url", help="Test a running server instead of the app in-process")
+    parser.add_argument("--no-mock", action="store_true", help="Use OPENAI_BASE_URL/OpenAI as configured")
+    parser.add_argument("--mock-args", default="--latency lognormal --latency-ms 300 --seed 1",
+                        help="Arguments for scripts.mock_openai_server")
+    parser.add_argument("--workers", type=int, default=4, help="In-process job loops when LLM_JOB_QUEUE=true")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json-out", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    mock = None
+    if not args.url and not args.no_mock:
+        port = free_port()
+        mock = subprocess.Popen(
+            [sys.executable, "-m", "scripts.mock_openai_server", "--port", str(port)] + shlex.split(args.mock_args)
+        )
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "mock")
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/stats", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+    try:
+        report = asyncio.run(run(args))
+        if mock is not None:
+            report["mock"] = httpx.get(f"http://127.0.0.1:{port}/stats", timeout=5).json()
+    finally:
+        if mock is not None:
+            mock.terminate()
+            mock.wait()
+
+    print_report(report)
+    if "mock" in report:
+        print(f"\nmock OpenAI: {report['mock']}")
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["failed_flows"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
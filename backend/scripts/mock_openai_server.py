@@ -0,0 +1,232 @@
+"""
+OpenAI-compatible stand-in for load tests
+
+Serves POST /v1/chat/completions (plain and streaming) with canned interview
+questions and answer evaluations, after a latency drawn from a configurable
+distribution, and fails or garbles a configurable share of requests. Point the API at it
+with OPENAI_BASE_URL=http://127.0.0.1:8100/v1.
+
+Usage (from backend/):
+    python -m scripts.mock_openai_server --port 8100 --latency lognormal --latency-ms 800 --error-rate 0.02
+    python -m scripts.mock_openai_server --malformed-rate 0.1    # exercises JSON recovery and repairs
+
+GET /stats returns request, error, malformed and in-flight counters.
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+
+QUESTION_TYPES = ("behavioral", "technical", "situational")
+# QuestionGenerator's prompt; looked for only at the start, before any user-supplied text
+QUESTION_PROMPT = re.compile(r"Generate (\d+) interview questions")
+# StructuredOutputParser's repair prompt, in the system message
+REPAIR_PROMPT = "You fix malformed JSON"
+
+class MockSettings:
+    """Latency, streaming and error injection settings"""
+
+    def __init__(
+        self,
+        latency: str = "fixed",
+        latency_ms: float = 500.0,
+        latency_sigma: float = 0.5,
+        latency_max_ms: float = 30000.0,
+        chunk_chars: int = 12,
+        chunk_delay_ms: float = 15.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        malformed_rate: float = 0.0,
+        seed: int = None
+    ):
+        self.latency = latency  # fixed, uniform, exponential or lognormal
+        self.latency_ms = latency_ms  # Mean latency before the first byte
+        self.latency_sigma = latency_sigma  # Shape of the lognormal distribution
+        self.latency_max_ms = latency_max_ms
+        self.chunk_chars = chunk_chars  # Characters per streamed chunk
+        self.chunk_delay_ms = chunk_delay_ms  # Delay between streamed chunks
+        self.error_rate = error_rate  # Share of requests that fail
+        self.error_status = error_status  # 429 or 5xx; the OpenAI client retries both
+        self.malformed_rate = malformed_rate  # Share of responses wrapped in prose or cut off
+        self.random = random.Random(seed)
+
+    def draw_latency(self) -> float:
+        """Draw one response latency, in seconds"""
+        mean = self.latency_ms
+        if self.latency == "fixed":
+            ms = mean
+        elif self.latency == "uniform":
+            ms = self.random.uniform(0, 2 * mean)
+        elif self.latency == "exponential":
+            ms = self.random.expovariate(1 / mean) if mean > 0 else 0
+        elif self.latency == "lognormal":
+            # Parameterized so the distribution's mean is latency_ms
+            mu = math.log(mean) - self.latency_sigma ** 2 / 2 if mean > 0 else 0
+            ms = self.random.lognormvariate(mu, self.latency_sigma) if mean > 0 else 0
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.latency}")
+        return min(ms, self.latency_max_ms) / 1000
+
+def _questions(prompt: str, rng: random.Random) -> str:
+    match = QUESTION_PROMPT.search(prompt[:300])
+    count = int(match.group(1)) if match else 5
+    difficulty = re.search(r"Difficulty level: (\w+)", prompt)
+    return json.dumps({"questions": [
+        {
+            "question_text": f"Mock question {i + 1}: tell me about a time you {rng.choice(['led', 'debugged', 'shipped', 'designed'])} something.",
+            "question_type": QUESTION_TYPES[i % len(QUESTION_TYPES)],
+            "difficulty": difficulty.group(1) if difficulty else "medium"
+        }
+        for i in range(count)
+    ]}, indent=2)
+
+def _evaluation(rng: random.Random) -> str:
+    scores = {field: rng.randint(50, 95) for field in ("relevance_score", "structure_score", "professionalism_score")}
+    scores["overall_score"] = round(sum(scores.values()) / 3)
+    return json.dumps({
+        **scores,
+        "strengths": "Clear example with a concrete outcome.",
+        "weaknesses": "The situation could be set up more briefly.",
+        "suggestions": "Quantify the result and name your own contribution.",
+        "star_analysis": "Situation and task are clear; action is brief; result is stated.",
+        "example_answer": "In my last role I noticed our deploys were failing weekly, so I..."
+    }, indent=2)
+
+def _malformed(content: str, rng: random.Random) -> str:
+    """What models send without JSON mode: a fenced block after prose, or a cut-off object"""
+    if rng.random() < 0.5:
+        return f"Here is the JSON you asked for:\n```json\n{content}\n```"
+    return content[:rng.randint(len(content) // 2, len(content) - 2)]
+
+def create_app(settings: MockSettings) -> FastAPI:
+    """Build the mock server for the given settings"""
+    app = FastAPI(title="Mock OpenAI")
+    counters: Dict[str, int] = {
+        "requests": 0, "errors": 0, "malformed": 0, "repairs": 0, "streams": 0, "in_flight": 0, "max_in_flight": 0
+    }
+
+    @app.get("/stats")
+    def stats():
+        return counters
+
+    @app.get("/v1/models")
+    def models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        counters["requests"] += 1
+        counters["in_flight"] += 1
+        counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+        try:
+            await asyncio.sleep(settings.draw_latency())
+
+            if settings.random.random() < settings.error_rate:
+                counters["errors"] += 1
+                return JSONResponse(
+                    status_code=settings.error_status,
+                    content={"error": {"message": "Injected failure", "type": "server_error", "code": None}}
+                )
+
+            messages: List[Dict] = body.get("messages", [])
+            prompt = messages[-1]["content"] if messages else ""
+            repair = bool(messages) and messages[0]["content"].startswith(REPAIR_PROMPT)
+            if repair:
+                counters["repairs"] += 1
+                question_schema = '"questions"' in messages[0]["content"]
+                content = _questions("", settings.random) if question_schema else _evaluation(settings.random)
+            elif QUESTION_PROMPT.search(prompt[:300]):
+                content = _questions(prompt, settings.random)
+            else:
+                content = _evaluation(settings.random)
+            if not repair and settings.random.random() < settings.malformed_rate:
+                counters["malformed"] += 1
+                content = _malformed(content, settings.random)
+        finally:
+            counters["in_flight"] -= 1
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "mock")
+
+        if body.get("stream"):
+            counters["streams"] += 1
+            return StreamingResponse(_stream(content, completion_id, created, model, settings), media_type="text/event-stream")
+
+        prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    return app
+
+async def _stream(content: str, completion_id: str, created: int, model: str, settings: MockSettings):
+    def chunk(delta: Dict, finish_reason: str = None) -> str:
+        data = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        return f"data: {json.dumps(data)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    for i in range(0, len(content), settings.chunk_chars):
+        await asyncio.sleep(settings.chunk_delay_ms / 1000)
+        yield chunk({"content": content[i:i + settings.chunk_chars]})
+    yield chunk({}, "stop")
+    yield "data: [DONE]\n\n"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "exponential", "lognormal"], default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Mean latency before the response")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal shape; larger means a longer tail")
+    parser.add_argument("--latency-max-ms", type=float, default=30000.0)
+    parser.add_argument("--chunk-chars", type=int, default=12)
+    parser.add_argument("--chunk-delay-ms", type=float, default=15.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests to fail, 0-1")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of responses to garble, 0-1")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    settings = MockSettings(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        latency_max_ms=args.latency_max_ms,
+        chunk_chars=args.chunk_chars,
+        chunk_delay_ms=args.chunk_delay_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(settings), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Maintain the user_stats summary table
+
+Commands:
+    backfill   Recompute user_stats rows from the sessions and answers tables
+    check      Compare user_stats rows against a full recompute and report drift
+
+Usage (from backend/):
+    python -m scripts.user_stats backfill [--user-id 42]
+    python -m scripts.user_stats check
+"""
+from sqlalchemy import select
+import argparse
+import asyncio
+import math
+import sys
+from typing import List, Optional
+
+from app import crud, models
+from app.database import async_engine, new_async_session
+
+async def _user_ids(db, user_id: Optional[int]) -> List[int]:
+    if user_id is not None:
+        return [user_id]
+    result = await db.execute(select(models.User.id).order_by(models.User.id))
+    return list(result.scalars().all())
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+    return a == b
+
+async def backfill(user_id: Optional[int]) -> int:
+    """Recompute user_stats, one committed transaction per user"""
+    db = new_async_session()
+    try:
+        user_ids = await _user_ids(db, user_id)
+        for uid in user_ids:
+            await crud.recompute_user_stats(db, uid)
+            await db.commit()
+        print(f"Backfilled user_stats for {len(user_ids)} users")
+        return 0
+    finally:
+        await db.close()
+
+async def check(user_id: Optional[int]) -> int:
+    """Report users whose maintained stats differ from a full recompute"""
+    db = new_async_session()
+    drifted = 0
+    try:
+        user_ids = await _user_ids(db, user_id)
+        for uid in user_ids:
+            stats = await db.get(models.UserStats, uid)
+            if stats is None:
+                drifted += 1
+                print(f"user {uid}: missing user_stats row")
+                continue
+
+            maintained = crud.user_stats_payload(stats)
+            expected = await crud.get_dashboard_stats(db, uid)
+            diffs = [
+                f"{field}={maintained[field]!r} (expected {expected[field]!r})"
+                for field in expected
+                if not _same(maintained[field], expected[field])
+            ]
+            if diffs:
+                drifted += 1
+                print(f"user {uid}: " + ", ".join(diffs))
+
+        print(f"Checked {len(user_ids)} users, {drifted} inconsistent")
+        return 1 if drifted else 0
+    finally:
+        await db.close()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["backfill", "check"])
+    parser.add_argument("--user-id", type=int, help="Only process this user")
+    args = parser.parse_args()
+
+    command = backfill if args.command == "backfill" else check
+
+    async def run() -> int:
+        try:
+            return await command(args.user_id)
+        finally:
+            if async_engine is not None:
+                await async_engine.dispose()
+
+    return asyncio.run(run())
+
+if __name__ == "__main__":
+    sys.exit(main())
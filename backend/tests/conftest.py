@@ -0,0 +1,33 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+# A PostgreSQL DATABASE_URL from the environment is kept for the tests that
+# need PostgreSQL; everything else runs on SQLite.
+_postgres_url = os.environ.get("DATABASE_URL", "")
+POSTGRES_DATABASE_URL = _postgres_url if _postgres_url.startswith(("postgresql", "postgres://")) else None
+
+# The engines in app.database are created at import time, so point them at a
+# throwaway SQLite file before any test module imports the app.
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["DB_ASYNC"] = "true"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.database import Base, async_engine, engine  # noqa: E402
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+@pytest.fixture(scope="session")
+def postgres_url() -> str:
+    """DATABASE_URL of a PostgreSQL database migrated to head; skips without one"""
+    if POSTGRES_DATABASE_URL is None:
+        pytest.skip("needs a PostgreSQL DATABASE_URL")
+    return POSTGRES_DATABASE_URL
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.services.answer_evaluator import AnswerEvaluator, EVALUATION_FIELDS  # noqa: E402
+
+RESPONSE = json.dumps({
+    "relevance_score": 140,
+    "structure_score": "65",
+    "professionalism_score": -5,
+    "overall_score": "n/a",
+    "strengths": ["Clear situation", "Measurable result"],
+    "weaknesses": {"action": "Too short"},
+    "suggestions": "Say more about your part",
+    "star_analysis": None,
+    "example_answer": 42
+})
+
+class _Completions:
+    async def create(self, **kwargs):
+        async def chunks():
+            for i in range(0, len(RESPONSE), 16):
+                delta = SimpleNamespace(content=RESPONSE[i:i + 16])
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+        return chunks()
+
+def _evaluator() -> AnswerEvaluator:
+    evaluator = AnswerEvaluator()
+    evaluator.client = SimpleNamespace(chat=SimpleNamespace(completions=_Completions()))
+    return evaluator
+
+async def _stream(evaluator: AnswerEvaluator) -> dict:
+    return {
+        field: value
+        async for field, value in evaluator.evaluate_answer_stream("Tell me about a project", "I built it")
+    }
+
+def test_streamed_fields_are_validated():
+    evaluator = _evaluator()
+
+    streamed = asyncio.run(_stream(evaluator))
+
+    assert streamed["relevance_score"] == 100.0
+    assert streamed["structure_score"] == 65.0
+    assert streamed["professionalism_score"] == 0.0
+    assert "overall_score" not in streamed
+    assert streamed["strengths"] == "Clear situation\nMeasurable result"
+    assert streamed["weaknesses"] == "action: Too short"
+    assert streamed["example_answer"] == "42"
+
+    evaluation = evaluator.complete_evaluation(streamed, "I built it")
+
+    assert set(evaluation) == set(EVALUATION_FIELDS)
+    assert evaluation["overall_score"] == (100.0 + 65.0 + 0.0) / 3
+    assert all(isinstance(evaluation[field], str) for field in EVALUATION_FIELDS if not field.endswith("_score"))
+
+def test_complete_evaluation_validates_collected_fields():
+    evaluation = _evaluator().complete_evaluation(
+        {"overall_score": 250, "strengths": ["Concise"]},
+        "I built it"
+    )
+
+    assert evaluation["overall_score"] == 100.0
+    assert evaluation["relevance_score"] == 100.0
+    assert evaluation["strengths"] == "Concise"
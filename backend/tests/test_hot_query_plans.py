@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import create_engine
+
+from scripts.explain_hot_queries import explain, hot_queries, seed
+
+# Large enough that the planner prefers the per-user indexes over scanning
+SEEDED_USERS = 2000
+SEEDED_SESSIONS = 200_000
+LARGE_TABLES = {"users", "interview_sessions", "questions", "answers"}
+
+@pytest.fixture(scope="module")
+def seeded(postgres_url):
+    """A connection to the seeded database, rolled back afterwards"""
+    engine = create_engine(postgres_url)
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            first_user_id = seed(conn, SEEDED_USERS, SEEDED_SESSIONS)
+            yield conn, first_user_id
+        finally:
+            transaction.rollback()
+    engine.dispose()
+
+@pytest.mark.parametrize("name", list(hot_queries(user_id=1)))
+def test_hot_query_avoids_sequential_scans(seeded, name):
+    conn, first_user_id = seeded
+    statement = hot_queries(user_id=first_user_id + 41)[name]
+
+    nodes = explain(conn, statement)
+
+    seq_scans = [n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"]
+    assert not LARGE_TABLES.intersection(seq_scans), f"{name} scans {seq_scans} sequentially"
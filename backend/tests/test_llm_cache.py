@@ -0,0 +1,31 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app import models
+from app.database import AsyncSessionLocal
+from app.services.llm_cache import SQLCache
+
+async def _cached_keys() -> list:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(models.LLMCacheEntry.key).filter(models.LLMCacheEntry.key.like("lru-%")))
+        return sorted(result.scalars().all())
+
+async def _fill_and_read(cache: SQLCache) -> tuple:
+    for i in range(6):
+        await cache.set(f"lru-{i}", {"value": i})
+        if i == 3:
+            # Used again, so it outlives the entries written before and after it
+            assert await cache.get("lru-1") == {"value": 1}
+        await asyncio.sleep(0.01)
+    return await cache.get("lru-0"), await cache.get("lru-5"), await _cached_keys()
+
+def test_sql_cache_keeps_most_recently_used_entries():
+    cache = SQLCache(max_entries=3)
+
+    evicted, latest, keys = asyncio.run(_fill_and_read(cache))
+
+    assert evicted is None
+    assert latest == {"value": 5}
+    assert keys == ["lru-1", "lru-4", "lru-5"]
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,34 @@
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.services.prompt_compactor import PromptCompactor, _approximate_tokens  # noqa: E402
+
+def _compactor() -> PromptCompactor:
+    return PromptCompactor(count_tokens=_approximate_tokens)
+
+def test_single_long_line_is_truncated_not_dropped():
+    text = "we need someone who knows python and likes teams and " * 200
+
+    result = _compactor().compact(text, max_tokens=50)
+
+    assert result.startswith("we need someone who knows python")
+    assert 0 < _approximate_tokens(result) <= 50
+
+def test_oversize_segment_fills_the_remaining_budget():
+    text = "Requirements:\n- Python\n- " + "distributed systems experience " * 100
+
+    result = _compactor().compact(text, max_tokens=60)
+
+    lines = result.split("\n")
+    assert lines[:2] == ["Requirements:", "- Python"]
+    assert lines[2].startswith("- distributed systems")
+    assert _approximate_tokens(result) <= 60
+
+def test_boilerplate_only_falls_back_to_a_prefix():
+    text = "Benefits:\n" + "Free lunch every day. " * 100
+
+    result = _compactor().compact(text, max_tokens=20)
+
+    assert result.startswith("Benefits:")
+    assert _approximate_tokens(result) <= 20
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app import crud, models
+from app.database import AsyncSessionLocal, SessionLocal, count_queries
+
+def _seed_session(answered: int) -> tuple:
+    """Create a session with `answered` questions, each with an answer and feedback"""
+    with SessionLocal() as db:
+        user = models.User(email=f"user{answered}@example.com", username=f"user{answered}", hashed_password="x")
+        db.add(user)
+        db.flush()
+        session = models.InterviewSession(user_id=user.id, job_title="Engineer", job_description="Build things")
+        db.add(session)
+        db.flush()
+        for order in range(answered):
+            question = models.Question(session_id=session.id, question_text=f"Question {order}?", order=order)
+            db.add(question)
+            db.flush()
+            answer = models.Answer(
+                session_id=session.id,
+                question_id=question.id,
+                answer_text="Answer",
+                overall_score=80.0
+            )
+            db.add(answer)
+            db.flush()
+            db.add(models.Feedback(answer_id=answer.id, strengths="Clear"))
+        db.commit()
+        return session.id, user.id
+
+async def _load_detail(session_id: int, user_id: int):
+    async with AsyncSessionLocal() as db:
+        with count_queries() as counter:
+            session = await crud.get_session_detail(db, session_id, user_id)
+            if session is not None:
+                # Walk the whole tree; anything not loaded up front would raise
+                for question in session.questions:
+                    assert question.answer.feedback is not None
+        return session, counter
+
+@pytest.mark.parametrize("answered", [1, 10])
+def test_session_detail_uses_two_queries(answered):
+    session_id, user_id = _seed_session(answered)
+
+    session, counter = asyncio.run(_load_detail(session_id, user_id))
+
+    assert counter.count == 2, counter.statements
+    assert len(session.questions) == answered
+
+def test_session_detail_hides_other_users_sessions():
+    session_id, user_id = _seed_session(2)
+
+    session, _ = asyncio.run(_load_detail(session_id, user_id + 1000))
+
+    assert session is None
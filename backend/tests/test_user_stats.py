@@ -0,0 +1,56 @@
+import asyncio
+import itertools
+
+import pytest
+from sqlalchemy import delete
+
+from app import crud, models
+from app.database import AsyncSessionLocal, SessionLocal, SyncSessionAdapter
+
+_user_numbers = itertools.count()
+
+SESSION_FACTORIES = {
+    "async": AsyncSessionLocal,
+    "sync": lambda: SyncSessionAdapter(SessionLocal(expire_on_commit=False)),
+}
+
+async def _delete_stats(db, user_id: int) -> None:
+    await db.execute(delete(models.UserStats).where(models.UserStats.user_id == user_id))
+    await db.commit()
+
+async def _stats(db, user_id: int) -> models.UserStats:
+    return await db.get(models.UserStats, user_id, populate_existing=True)
+
+async def _rebuild_missing_rows(new_session) -> None:
+    db = new_session()
+    try:
+        number = next(_user_numbers)
+        user = models.User(email=f"stats{number}@example.com", username=f"stats{number}", hashed_password="x")
+        db.add(user)
+        await db.flush()
+
+        # No row yet: creating a session rebuilds it, pending session included
+        session = await crud.create_interview_session(db, user.id, "Engineer", None, "Build things")
+        await db.commit()
+        stats = await _stats(db, user.id)
+        assert (stats.total_sessions, stats.completed_sessions) == (1, 0)
+
+        await _delete_stats(db, user.id)
+        question = models.Question(session_id=session.id, question_text="Why?", order=1)
+        db.add(question)
+        await db.flush()
+        db.add(models.Answer(session_id=session.id, question_id=question.id, answer_text="Because", overall_score=80.0))
+        await db.flush()
+        await crud.update_session_score(db, session)
+        await db.commit()
+
+        stats = await _stats(db, user.id)
+        assert (stats.total_sessions, stats.completed_sessions) == (1, 1)
+        assert (stats.score_sum, stats.score_count) == (80.0, 1)
+        assert stats.second_half_count == 1
+    finally:
+        await db.close()
+
+@pytest.mark.parametrize("mode", SESSION_FACTORIES)
+def test_missing_stats_row_is_rebuilt(mode):
+    asyncio.run(_rebuild_missing_rows(SESSION_FACTORIES[mode]))